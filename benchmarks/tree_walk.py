@@ -0,0 +1,116 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core import FileProcessor, FolderReadError
+
+
+class LegacyTreeProcessor(FileProcessor):
+    def _is_ignored(self, item_name):
+        return item_name in self.ignored_dirs or item_name.lower().endswith("egg-info")
+
+    def _build_tree(self, folder, prefix, lines, show_ignored=True, current_depth=0, max_depth=None, **limits):
+        if max_depth is not None and current_depth >= max_depth:
+            return
+
+        try:
+            items = os.listdir(folder)
+        except Exception as e:
+            self._report_error(FolderReadError(folder, e))
+            return
+
+        items = sorted(items, key=lambda x: (not os.path.isdir(os.path.join(folder, x)), x.lower()))
+        for index, item in enumerate(items):
+            full_path = os.path.join(folder, item)
+            connector = "└── " if index == len(items) - 1 else "├── "
+            new_prefix = prefix + ("    " if index == len(items) - 1 else "│   ")
+
+            if os.path.isdir(full_path):
+                if self._is_ignored(item):
+                    if show_ignored:
+                        lines.append(prefix + connector + item)
+                        lines.append(new_prefix + "...")
+                    continue
+
+            lines.append(prefix + connector + item)
+            if os.path.isdir(full_path):
+                self._build_tree(full_path, new_prefix, lines, show_ignored, current_depth + 1, max_depth)
+
+
+def make_tree(root, dirs_per_level, files_per_dir, depth):
+    count = 0
+    level = [root]
+    for _ in range(depth):
+        next_level = []
+        for folder in level:
+            for f in range(files_per_dir):
+                with open(os.path.join(folder, f"file_{f}.py"), "w") as fh:
+                    fh.write("x = 1\n")
+                count += 1
+            for d in range(dirs_per_level):
+                sub = os.path.join(folder, f"dir_{d}")
+                os.mkdir(sub)
+                next_level.append(sub)
+                count += 1
+        level = next_level
+    os.mkdir(os.path.join(root, "node_modules"))
+    return count + 1
+
+
+def count_syscalls(func):
+    counts = Counter()
+    originals = {name: getattr(os, name) for name in ("stat", "listdir", "scandir")}
+
+    def wrap(name):
+        def counted(*args, **kwargs):
+            counts[name] += 1
+            return originals[name](*args, **kwargs)
+        return counted
+
+    for name in originals:
+        setattr(os, name, wrap(name))
+    try:
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+    finally:
+        for name, original in originals.items():
+            setattr(os, name, original)
+    return result, counts, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the listdir and scandir ASCII tree walkers.")
+    parser.add_argument("path", nargs="?", help="Existing folder to walk (a synthetic tree is built if omitted)")
+    parser.add_argument("--dirs", type=int, default=4)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--depth", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = args.path
+        if root is None:
+            root = os.path.join(tmp, "tree")
+            os.mkdir(root)
+            entries = make_tree(root, args.dirs, args.files, args.depth)
+            print(f"Synthetic tree: {entries} entries")
+
+        legacy_text, legacy_calls, legacy_time = count_syscalls(
+            lambda: LegacyTreeProcessor().generate_ascii_tree(root))
+        scandir_text, scandir_calls, scandir_time = count_syscalls(
+            lambda: FileProcessor().generate_ascii_tree(root, use_gitignore=False))
+
+    print(f"{'walker':<10}{'stat':>10}{'listdir':>10}{'scandir':>10}{'seconds':>10}")
+    for name, calls, elapsed in (("listdir", legacy_calls, legacy_time), ("scandir", scandir_calls, scandir_time)):
+        print(f"{name:<10}{calls['stat']:>10}{calls['listdir']:>10}{calls['scandir']:>10}{elapsed:>10.3f}")
+    print("Identical output:", legacy_text == scandir_text)
+    return 0 if legacy_text == scandir_text else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
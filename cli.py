@@ -0,0 +1,131 @@
+import argparse
+import os
+import sys
+
+from core.file_processor import CONTENT_CACHE, DEFAULT_TREE_LIMITS, FileProcessor
+from core.report import FAILED, ProcessingReport, error_entry, skipped_entry
+
+EXIT_OK = 0
+EXIT_ERRORS = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+FOLDER_SOURCES = ["filesystem", "git", "git_index", "git_head"]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="pixmerge",
+        description="Merge text files and folder trees into a single Markdown or XML document without the GUI."
+    )
+    parser.add_argument("paths", nargs="+", help="Files or folders to merge, in order")
+    parser.add_argument("-o", "--output", help="Write to this file instead of standard output")
+    parser.add_argument("--format", choices=["markdown", "xml"], default="markdown")
+    parser.add_argument("--path-style", choices=["filename", "full", "relative"], default="filename")
+    parser.add_argument("--project-root", help="Folder name that relative paths start from")
+    parser.add_argument("--no-language", action="store_true", help="Omit language tags on Markdown code fences")
+    parser.add_argument("--folder-contents", action="store_true",
+                        help="Merge the contents of every text file in dropped folders after their tree")
+    parser.add_argument("--hide-ignored", action="store_true", help="Leave ignored folders out of trees")
+    parser.add_argument("--ignore", action="append", default=[], metavar="PATTERN",
+                        help="Extra ignore rule (.gitignore syntax); can be repeated")
+    parser.add_argument("--no-default-ignores", action="store_true", help="Start from an empty ignore list")
+    parser.add_argument("--no-gitignore", action="store_true", help="Do not read .gitignore files")
+    parser.add_argument("--source", choices=FOLDER_SOURCES, default="filesystem",
+                        help="Where folder contents come from")
+    parser.add_argument("--index", action="store_true", help="Use the per-project index for faster repeat runs")
+    parser.add_argument("--max-depth", type=int, default=DEFAULT_TREE_LIMITS["tree_max_depth"],
+                        help="Tree depth limit (0 = unlimited)")
+    parser.add_argument("--max-entries", type=int, default=DEFAULT_TREE_LIMITS["tree_max_entries"],
+                        help="Entries per folder (0 = unlimited)")
+    parser.add_argument("--max-lines", type=int, default=DEFAULT_TREE_LIMITS["tree_max_lines"],
+                        help="Total tree lines (0 = unlimited)")
+    parser.add_argument("--workers", type=int, default=FileProcessor.DEFAULT_READ_WORKERS,
+                        help="Parallel file readers")
+    parser.add_argument("-q", "--quiet", action="store_true", help="Do not report skipped files")
+    parser.add_argument("--report", metavar="CSV", help="Write skipped and failed files to this CSV file")
+    return parser
+
+
+def build_settings(args):
+    settings = {
+        'format': args.format,
+        'path_style': args.path_style,
+        'project_root': args.project_root,
+        'add_language': not args.no_language,
+        'show_ignored': not args.hide_ignored,
+        'use_gitignore': not args.no_gitignore,
+        'folder_source': args.source,
+        'use_index': args.index,
+        'folder_mode': 'tree_contents' if args.folder_contents else 'tree',
+    }
+    for key, value in (('tree_max_depth', args.max_depth), ('tree_max_entries', args.max_entries),
+                       ('tree_max_lines', args.max_lines)):
+        settings[key] = value if value > 0 else None
+    return settings
+
+
+def run(args, out, err):
+    report = ProcessingReport()
+
+    def on_error(error):
+        report.add(error_entry(error))
+        err.write(f"error: {error}\n")
+
+    def on_skip(path, reason):
+        report.add(skipped_entry(path, reason))
+        if not args.quiet:
+            err.write(f"skipped: {path}: {reason}\n")
+
+    CONTENT_CACHE.set_budget(0)
+    processor = FileProcessor(on_error=on_error, on_skip=on_skip, read_workers=args.workers)
+    if args.no_default_ignores:
+        processor.ignored_dirs = args.ignore
+    elif args.ignore:
+        processor.ignored_dirs = processor.ignored_dirs + args.ignore
+
+    for _, block in processor.process_many(args.paths, build_settings(args)):
+        if block is not None:
+            out.write(block)
+            out.write("\n")
+    if report and not args.quiet:
+        err.write(f"{report.summary()}\n")
+    if args.report:
+        report.write_csv(args.report)
+    return EXIT_ERRORS if report.count(FAILED) else EXIT_OK
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    missing = [path for path in args.paths if not os.path.exists(path)]
+    if missing:
+        for path in missing:
+            sys.stderr.write(f"error: no such file or folder: {path}\n")
+        return EXIT_USAGE
+
+    try:
+        if args.output is None:
+            sys.stdout.reconfigure(encoding='utf-8')
+            return run(args, sys.stdout, sys.stderr)
+        partial_path = args.output + ".part"
+        try:
+            with open(partial_path, 'w', encoding='utf-8') as out:
+                status = run(args, out, sys.stderr)
+            os.replace(partial_path, args.output)
+        except BaseException:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+        return status
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+    except BrokenPipeError:
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return EXIT_OK
+    except OSError as e:
+        sys.stderr.write(f"error: {e}\n")
+        return EXIT_ERRORS
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,2 @@
+from core.errors import MergeError, FileReadError, FolderReadError, GitSourceError, ProjectIndexError
+from core.file_processor import FileProcessor
\ No newline at end of file
@@ -0,0 +1,25 @@
+class MergeError(Exception):
+    title = "Error"
+    action = "Error processing"
+
+    def __init__(self, path, reason):
+        super().__init__(f"{self.action} {path}: {reason}")
+        self.path = path
+        self.reason = reason
+        self.cause = reason if isinstance(reason, BaseException) else None
+
+
+class FileReadError(MergeError):
+    action = "Error reading file"
+
+
+class FolderReadError(MergeError):
+    action = "Error accessing folder"
+
+
+class GitSourceError(MergeError):
+    action = "Error listing git files in"
+
+
+class ProjectIndexError(MergeError):
+    action = "Error opening project index for"
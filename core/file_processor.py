@@ -0,0 +1,673 @@
+import mmap
+import os
+import sys
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from core.errors import FileReadError, FolderReadError, GitSourceError, ProjectIndexError
+from core.folder_scan import scan_folder
+from core.git_source import GitRepository, HEAD_REVISION, INDEX_REVISION
+from core.ignore_rules import IgnoreEngine
+from core.merge_session import MergeSection
+from core.project_index import ProjectIndex
+
+
+EXTENSION_MAP = {
+    '.c': 'c',
+    '.cpp': 'cpp',
+    '.cs': 'csharp',
+    '.css': 'css',
+    '.dart': 'dart',
+    '.elixir': 'elixir',
+    '.ex': 'elixir',
+    '.exs': 'elixir',
+    '.go': 'go',
+    '.h': 'c',
+    '.htm': 'html',
+    '.html': 'html',
+    '.java': 'java',
+    '.js': 'javascript',
+    '.json': 'json',
+    '.kt': 'kotlin',
+    '.less': 'less',
+    '.markdown': 'markdown',
+    '.md': 'markdown',
+    '.php': 'php',
+    '.pl': 'perl',
+    '.py': 'python',
+    '.r': 'r',
+    '.rb': 'ruby',
+    '.rs': 'rust',
+    '.scss': 'scss',
+    '.sh': 'bash',
+    '.sql': 'sql',
+    '.swift': 'swift',
+    '.ts': 'typescript',
+    '.tsx': 'typescriptreact',
+    '.xml': 'xml',
+    '.yaml': 'yaml',
+    '.yml': 'yaml'
+}
+
+
+BINARY_EXTENSIONS = {
+    '.7z', '.a', '.avi', '.bin', '.bmp', '.bz2', '.class', '.db', '.dll', '.doc', '.docx', '.dylib',
+    '.egg', '.eot', '.exe', '.flac', '.gif', '.gz', '.h5', '.icns', '.ico', '.jar', '.jpeg', '.jpg',
+    '.lib', '.mkv', '.mov', '.mp3', '.mp4', '.npy', '.npz', '.o', '.obj', '.odt', '.ogg', '.otf',
+    '.parquet', '.pdf', '.pkl', '.png', '.ppt', '.pptx', '.psd', '.pyc', '.pyd', '.pyo', '.qm',
+    '.rar', '.rcc', '.rlib', '.so', '.sqlite', '.tar', '.tgz', '.tif', '.tiff', '.ttf', '.war',
+    '.wasm', '.wav', '.webm', '.webp', '.whl', '.woff', '.woff2', '.xls', '.xlsx', '.xz', '.zip'
+}
+
+TEXT_EXTENSIONS = set(EXTENSION_MAP) | {
+    '.bat', '.cc', '.cfg', '.cjs', '.cmake', '.conf', '.csv', '.gradle', '.graphql', '.hpp', '.ini',
+    '.jsx', '.lua', '.mjs', '.properties', '.proto', '.ps1', '.qrc', '.rst', '.svelte', '.svg',
+    '.tex', '.toml', '.tsv', '.txt', '.ui', '.vue'
+}
+
+MAGIC_NUMBERS = [
+    (b'\x89PNG\r\n\x1a\n', "PNG image"),
+    (b'\xff\xd8\xff', "JPEG image"),
+    (b'GIF87a', "GIF image"),
+    (b'GIF89a', "GIF image"),
+    (b'%PDF-', "PDF document"),
+    (b'PK\x03\x04', "ZIP archive"),
+    (b'\x1f\x8b', "gzip archive"),
+    (b'7z\xbc\xaf\x27\x1c', "7-Zip archive"),
+    (b'Rar!\x1a\x07', "RAR archive"),
+    (b'\x7fELF', "ELF binary"),
+    (b'\xca\xfe\xba\xbe', "Mach-O or Java class binary"),
+    (b'\xcf\xfa\xed\xfe', "Mach-O binary"),
+    (b'\xfe\xed\xfa\xcf', "Mach-O binary"),
+    (b'wOFF', "WOFF font"),
+    (b'wOF2', "WOFF2 font"),
+    (b'OggS', "Ogg media"),
+    (b'fLaC', "FLAC audio"),
+    (b'ID3', "MP3 audio"),
+    (b'RIFF', "RIFF media"),
+    (b'SQLite format 3\x00', "SQLite database"),
+]
+
+SNIFF_SIZE = 1024
+MMAP_THRESHOLD = 1024 * 1024
+
+DEFAULT_TREE_LIMITS = {
+    "tree_max_depth": 0,
+    "tree_max_entries": 1000,
+    "tree_max_lines": 10000
+}
+
+def classify_extension(file_path):
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in BINARY_EXTENSIONS:
+        return False, f"binary file type '{ext}'"
+    if ext in TEXT_EXTENSIONS:
+        return True, None
+    return None, None
+
+
+def sniff_binary(head):
+    for magic, description in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return description
+    if b'\x00' in head:
+        return "contains NUL bytes"
+    return None
+
+
+class FolderListing:
+    def __init__(self, entries=None, source=None, gitignores=None, frozen=False):
+        self.entries = {} if entries is None else entries
+        self.source = source
+        self.gitignores = {} if gitignores is None else gitignores
+        self.frozen = frozen
+
+    def is_listed(self, folder):
+        return not self.frozen or self.source is not None or folder in self.entries
+
+    def get(self, folder, default=()):
+        entries = self.entries.get(folder)
+        if entries is None:
+            if self.source is not None:
+                entries = list(self.source.get(folder, default))
+            elif self.frozen:
+                return default
+            else:
+                entries = scan_folder(folder)
+            self.entries[folder] = entries
+        return entries
+
+    def load_gitignore(self, path, load):
+        if self.frozen or path in self.gitignores:
+            return self.gitignores.get(path)
+        matcher = self.gitignores[path] = load(path)
+        return matcher
+
+    def snapshot(self):
+        return FolderListing(dict(self.entries), self.source if isinstance(self.source, dict) else None,
+                             dict(self.gitignores), frozen=True)
+
+
+def _decode_text(data):
+    try:
+        content = str(data, 'utf-8')
+    except UnicodeDecodeError as e:
+        if e.start < SNIFF_SIZE:
+            return None
+        raise
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _decode_or_reason(data):
+    content = _decode_text(data)
+    if content is None:
+        return None, "not valid UTF-8 text"
+    return content, None
+
+
+def decode_text_bytes(file_path, data):
+    is_text, reason = classify_extension(file_path)
+    if is_text is False:
+        return None, reason
+    if is_text is None:
+        reason = sniff_binary(data[:SNIFF_SIZE])
+        if reason is not None:
+            return None, reason
+    return _decode_or_reason(data)
+
+
+def read_text_file(file_path):
+    is_text, reason = classify_extension(file_path)
+    if is_text is False:
+        return None, reason
+    with open(file_path, 'rb') as f:
+        if is_text is None:
+            head = f.read(SNIFF_SIZE)
+            reason = sniff_binary(head)
+            if reason is not None:
+                return None, reason
+            if len(head) < SNIFF_SIZE:
+                return _decode_or_reason(head)
+            f.seek(0)
+        size = os.fstat(f.fileno()).st_size
+        if size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return _decode_or_reason(mapped)
+        return _decode_or_reason(f.read())
+
+
+class ContentCache:
+    DEFAULT_BUDGET = 256 * 1024 * 1024
+
+    def __init__(self, budget=DEFAULT_BUDGET):
+        self.budget = budget
+        self.hits = 0
+        self.misses = 0
+        self.total_size = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _entry_size(content, blocks):
+        size = sys.getsizeof(content) if content is not None else 0
+        return size + sum(sys.getsizeof(block) for block in blocks.values())
+
+    def _lookup(self, path, st):
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        if entry[0] != st.st_mtime_ns or entry[1] != st.st_size:
+            self._remove(path)
+            return None
+        self._entries.move_to_end(path)
+        return entry
+
+    def _remove(self, path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self.total_size -= entry[5]
+
+    def _evict(self):
+        while self.total_size > self.budget and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self.total_size -= entry[5]
+
+    def get_block(self, path, st, format_key):
+        with self._lock:
+            entry = self._lookup(path, st)
+            return entry[4].get(format_key) if entry is not None else None
+
+    def get_content(self, path, st):
+        with self._lock:
+            entry = self._lookup(path, st)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[2], entry[3]
+
+    def put_content(self, path, st, content, reason):
+        size = self._entry_size(content, {})
+        with self._lock:
+            self._remove(path)
+            if size > self.budget:
+                return
+            self._entries[path] = (st.st_mtime_ns, st.st_size, content, reason, {}, size)
+            self.total_size += size
+            self._evict()
+
+    def put_block(self, path, st, format_key, block):
+        with self._lock:
+            entry = self._lookup(path, st)
+            if entry is None:
+                return
+            blocks = dict(entry[4])
+            blocks[format_key] = block
+            size = self._entry_size(entry[2], blocks)
+            self.total_size += size - entry[5]
+            self._entries[path] = entry[:4] + (blocks, size)
+            self._evict()
+
+    def set_budget(self, budget):
+        with self._lock:
+            self.budget = budget
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_size = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+                'size': self.total_size,
+                'budget': self.budget
+            }
+
+
+CONTENT_CACHE = ContentCache()
+
+
+class FileProcessor:
+    DEFAULT_READ_WORKERS = 8
+
+    def __init__(self, ignored_dirs=None, on_error=None, on_skip=None, cancel_event=None, read_workers=None,
+                 ignore_engine=None):
+        self.on_error = on_error
+        self.on_skip = on_skip
+        self.cancel_event = cancel_event
+        self.read_workers = read_workers if read_workers else self.DEFAULT_READ_WORKERS
+        if ignore_engine is not None:
+            self.ignore_engine = ignore_engine
+        elif ignored_dirs is not None:
+            self.ignored_dirs = ignored_dirs
+        else:
+            self.ignored_dirs = [
+                ".idea", ".vscode", ".venv", ".env", "venv", "env", "__pycache__",
+                ".mypy_cache", ".pytest_cache", ".git", "node_modules", "dist",
+                "build", "target", "out", ".next", ".expo", ".turbo", ".cache", ".coverage"
+            ]
+
+    @property
+    def ignored_dirs(self):
+        return self.ignore_engine.patterns
+
+    @ignored_dirs.setter
+    def ignored_dirs(self, patterns):
+        self.ignore_engine = IgnoreEngine(patterns)
+
+    def _report_error(self, error):
+        if self.on_error is None:
+            raise error
+        self.on_error(error)
+
+    def _report_skip(self, path, reason):
+        if self.on_skip is not None:
+            self.on_skip(path, reason)
+
+    def _is_cancelled(self):
+        return self.cancel_event is not None and self.cancel_event.is_set()
+
+    def process_file(self, file_path, settings, index=None):
+        if os.path.isdir(file_path) and self.expands_folders(settings):
+            return "\n".join(result for _, result in self.process_many([file_path], settings)
+                             if result is not None)
+        section = self.process_section(file_path, settings, index)
+        return section.block if section is not None else None
+
+    def process_section(self, file_path, settings, index=None):
+        if os.path.isdir(file_path):
+            return self._tree_section(file_path, settings)
+
+        is_text, reason = classify_extension(file_path)
+        if is_text is False:
+            self._report_skip(file_path, reason)
+            return None
+
+        format_key = self._format_key(settings)
+        try:
+            st = os.stat(file_path)
+            cached = CONTENT_CACHE.get_content(file_path, st)
+            if cached is None:
+                content, reason = self._read_text(file_path, st, index)
+                CONTENT_CACHE.put_content(file_path, st, content, reason)
+            else:
+                content, reason = cached
+        except Exception as e:
+            self._report_error(FileReadError(file_path, e))
+            return None
+        if content is None:
+            self._report_skip(file_path, reason)
+            return None
+        block = CONTENT_CACHE.get_block(file_path, st, format_key)
+        if block is None:
+            block = self.format_content(file_path, content, settings)
+            CONTENT_CACHE.put_block(file_path, st, format_key, block)
+        return MergeSection(file_path, 'file', content, block, mtime_ns=st.st_mtime_ns, size=st.st_size)
+
+    @staticmethod
+    def _format_key(settings):
+        return (settings.get('format', 'markdown'), settings.get('path_style'), settings.get('project_root'),
+                settings.get('add_language', True))
+
+    @staticmethod
+    def _read_text(file_path, st, index=None):
+        if index is None:
+            return read_text_file(file_path)
+        cached = index.lookup_file(file_path, st)
+        if cached is not None:
+            return cached
+        content, reason = read_text_file(file_path)
+        index.store_file(file_path, st, content, reason)
+        return content, reason
+
+    def _process_blob(self, file_path, data, settings, source):
+        if data is None:
+            self._report_skip(file_path, "file name contains a newline" if "\n" in file_path else "not found in git")
+            return None
+        try:
+            content, reason = decode_text_bytes(file_path, data)
+        except Exception as e:
+            self._report_error(FileReadError(file_path, e))
+            return None
+        if content is None:
+            self._report_skip(file_path, reason)
+            return None
+        return MergeSection(file_path, 'file', content, self.format_content(file_path, content, settings),
+                            source=source, size=len(data))
+
+    def format_content(self, file_path, content, settings):
+        if settings.get('path_style') == 'filename':
+            display_name = os.path.basename(file_path)
+        elif settings.get('path_style') == 'full':
+            display_name = file_path
+        elif settings.get('path_style') == 'relative':
+            project_root = settings.get('project_root')
+            if project_root:
+                normalized_path = os.path.normpath(file_path)
+                path_parts = normalized_path.split(os.sep)
+                if project_root in path_parts:
+                    idx = path_parts.index(project_root)
+                    display_name = os.sep.join(path_parts[idx:])
+                else:
+                    display_name = file_path
+            else:
+                display_name = file_path
+        else:
+            display_name = os.path.basename(file_path)
+
+        format_type = settings.get('format', 'markdown')
+        if format_type == 'markdown':
+            _, ext = os.path.splitext(file_path)
+            lang = EXTENSION_MAP.get(ext.lower(), '') if settings.get('add_language', True) else ''
+            code_block = f"```{lang}\n{content}\n```" if lang else f"```\n{content}\n```"
+            return f"{display_name}:\n{code_block}"
+        else:
+            return f"<{display_name}>\n{content}\n</{display_name}>"
+
+    def _generate_tree_for_settings(self, folder_path, settings, files=None, listing=None, use_gitignore=True):
+        return self.generate_ascii_tree(
+            folder_path,
+            show_ignored=settings.get('show_ignored', True),
+            max_depth=settings.get('tree_max_depth'),
+            max_entries=settings.get('tree_max_entries'),
+            max_lines=settings.get('tree_max_lines'),
+            use_gitignore=settings.get('use_gitignore', True) and use_gitignore,
+            files=files,
+            listing=listing
+        )
+
+    def _tree_section(self, folder_path, settings, files=None, listing=None, use_gitignore=True,
+                      source='filesystem'):
+        listing = listing if isinstance(listing, FolderListing) else FolderListing(source=listing)
+        tree = self._generate_tree_for_settings(folder_path, settings, files=files, listing=listing,
+                                                use_gitignore=use_gitignore)
+        section = MergeSection(folder_path, 'tree', tree, tree, source)
+        section.listing = listing
+        section.use_gitignore = use_gitignore
+        return section
+
+    def rerender_section(self, section, settings):
+        if section.kind == 'tree':
+            return self._tree_section(section.path, settings, listing=section.listing.snapshot(),
+                                      use_gitignore=section.use_gitignore, source=section.source)
+        block = self.format_content(section.path, section.raw_content, settings)
+        return MergeSection(section.path, section.kind, section.raw_content, block, section.source,
+                            section.mtime_ns, section.size)
+
+    @staticmethod
+    def expands_folders(settings):
+        return settings.get('folder_mode') == 'tree_contents' or settings.get('use_index', False) or \
+            settings.get('folder_source', 'filesystem') != 'filesystem'
+
+    def _open_index(self, folder_path, indexes):
+        try:
+            index = ProjectIndex(folder_path)
+        except Exception as e:
+            self._report_error(ProjectIndexError(folder_path, e))
+            return None
+        indexes.append(index)
+        return index
+
+    def _iter_folder_tasks(self, folder_path, settings, process, indexes):
+        source = settings.get('folder_source', 'filesystem')
+        repo = GitRepository.discover(folder_path) if source != 'filesystem' else None
+        revision = {'git_index': INDEX_REVISION, 'git_head': HEAD_REVISION}.get(source) if repo else None
+
+        listing = None
+        submodules = ()
+        if repo is not None:
+            try:
+                listing, submodules = repo.build_listing(repo.list_files(revision or None))
+            except Exception as e:
+                self._report_error(GitSourceError(folder_path, e))
+                repo = revision = None
+
+        index = None
+        if repo is None and settings.get('use_index', False):
+            index = listing = self._open_index(folder_path, indexes)
+
+        files = [] if settings.get('folder_mode') == 'tree_contents' else None
+        tree = self._tree_section(folder_path, settings, files=files, listing=listing, use_gitignore=repo is None,
+                                  source=source if repo is not None else 'filesystem')
+        yield folder_path, lambda: tree
+        if files is None:
+            return
+
+        for submodule in submodules:
+            yield submodule, partial(self._report_skip, submodule, "git submodule")
+        files = [file_path for file_path in files if classify_extension(file_path)[0] is not False]
+        if revision is None:
+            for file_path in files:
+                yield file_path, partial(process, file_path, index)
+            return
+        for file_path, data in repo.read_blobs(files, revision):
+            if self._is_cancelled():
+                return
+            yield file_path, partial(self._process_blob, file_path, data, settings, source)
+
+    def _iter_tasks(self, paths, settings, indexes):
+        def process(path, index=None):
+            if self._is_cancelled():
+                return None
+            if os.path.isdir(path) or os.path.isfile(path):
+                return self.process_section(path, settings, index)
+            return None
+
+        expand_folders = self.expands_folders(settings)
+        for path in paths:
+            if expand_folders and os.path.isdir(path):
+                yield from self._iter_folder_tasks(path, settings, process, indexes)
+            else:
+                yield path, partial(process, path)
+
+    def process_many(self, paths, settings):
+        for path, section in self.process_many_sections(paths, settings):
+            yield path, section.block if section is not None else None
+
+    def process_many_sections(self, paths, settings):
+        indexes = []
+        tasks = self._iter_tasks(paths, settings, indexes)
+        try:
+            yield from self._run_tasks(tasks)
+        finally:
+            tasks.close()
+            for index in indexes:
+                index.close()
+
+    def _run_tasks(self, tasks):
+        if self.read_workers <= 1:
+            for path, task in tasks:
+                if self._is_cancelled():
+                    return
+                yield path, task()
+            return
+
+        window = self.read_workers * 2
+        pending = deque()
+        executor = ThreadPoolExecutor(max_workers=self.read_workers, thread_name_prefix="pix-read")
+        try:
+            for path, task in tasks:
+                if self._is_cancelled():
+                    return
+                pending.append((path, executor.submit(task)))
+                if len(pending) >= window:
+                    done_path, future = pending.popleft()
+                    yield done_path, future.result()
+            while pending:
+                if self._is_cancelled():
+                    return
+                done_path, future = pending.popleft()
+                yield done_path, future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def generate_ascii_tree(self, folder_path, show_ignored=True, max_depth=None, max_entries=None, max_lines=None,
+                            use_gitignore=True, files=None, listing=None):
+        folder_path = os.path.normpath(folder_path)
+        lines = [os.path.basename(folder_path)]
+        context = self.ignore_engine.root_context(folder_path, use_gitignore)
+        truncated = self._build_tree(folder_path, "", lines, show_ignored, current_depth=0, max_depth=max_depth,
+                                     max_entries=max_entries, max_lines=max_lines, files=files,
+                                     ignore_context=context, listing=listing)
+        if truncated:
+            lines.append(f"... (tree truncated at {max_lines} lines)")
+        return "\n".join(lines)
+
+    def _visible_entries(self, folder, show_ignored, ignore_context, listing):
+        try:
+            entries = list(listing.get(folder, ())) if listing is not None else scan_folder(folder)
+        except Exception as e:
+            self._report_error(FolderReadError(folder, e))
+            return None, ignore_context
+
+        if ignore_context is None:
+            ignore_context = self.ignore_engine.root_context(folder)
+        load = None
+        if listing is not None:
+            load = partial(listing.load_gitignore, load=self.ignore_engine.load_gitignore)
+        ignore_context = self.ignore_engine.child_context(ignore_context, folder, {e[0] for e in entries}, load)
+
+        visible = []
+        for item, full_path, is_dir in entries:
+            ignored = self.ignore_engine.is_ignored(ignore_context, full_path, is_dir)
+            if ignored and not (is_dir and show_ignored):
+                continue
+            visible.append((item, full_path, is_dir, ignored))
+        visible.sort(key=lambda e: (not e[2], e[0].lower()))
+        return visible, ignore_context
+
+    def _collect_files(self, entries, files, ignore_context, listing):
+        for _, full_path, is_dir, ignored in entries:
+            if self._is_cancelled():
+                return
+            if ignored:
+                continue
+            if not is_dir:
+                files.append(full_path)
+                continue
+            visible, context = self._visible_entries(full_path, False, ignore_context, listing)
+            if visible is not None:
+                self._collect_files(visible, files, context, listing)
+
+    def _build_tree(self, folder, prefix, lines, show_ignored=True, current_depth=0, max_depth=None,
+                    max_entries=None, max_lines=None, files=None, ignore_context=None, listing=None):
+        if self._is_cancelled():
+            return False
+        if max_depth is not None and current_depth >= max_depth:
+            if files is not None:
+                visible, context = self._visible_entries(folder, False, ignore_context, listing)
+                if visible is not None:
+                    self._collect_files(visible, files, context, listing)
+            return False
+        if listing is not None and not listing.is_listed(folder):
+            lines.append(prefix + "...")
+            return False
+
+        visible, ignore_context = self._visible_entries(folder, show_ignored, ignore_context, listing)
+        if visible is None:
+            return False
+
+        hidden = []
+        if max_entries is not None and len(visible) > max_entries:
+            hidden = visible[max_entries:]
+            del visible[max_entries:]
+
+        last_index = len(visible) - 1 if not hidden else len(visible)
+        for index, (item, full_path, is_dir, ignored) in enumerate(visible):
+            if max_lines is not None and len(lines) >= max_lines:
+                if files is not None:
+                    self._collect_files(visible[index:] + hidden, files, ignore_context, listing)
+                return True
+            connector = "└── " if index == last_index else "├── "
+            new_prefix = prefix + ("    " if index == last_index else "│   ")
+
+            lines.append(prefix + connector + item)
+            if ignored:
+                lines.append(new_prefix + "...")
+            elif not is_dir:
+                if files is not None:
+                    files.append(full_path)
+            elif self._build_tree(full_path, new_prefix, lines, show_ignored, current_depth + 1, max_depth,
+                                  max_entries, max_lines, files, ignore_context, listing):
+                if files is not None:
+                    self._collect_files(visible[index + 1:] + hidden, files, ignore_context, listing)
+                return True
+
+        if hidden:
+            if files is not None:
+                self._collect_files(hidden, files, ignore_context, listing)
+            if max_lines is not None and len(lines) >= max_lines:
+                return True
+            lines.append(prefix + f"└── ... ({len(hidden)} more)")
+        return False
@@ -0,0 +1,13 @@
+import os
+
+
+def _entry_is_dir(entry):
+    try:
+        return entry.is_dir()
+    except OSError:
+        return False
+
+
+def scan_folder(folder):
+    with os.scandir(folder) as it:
+        return [(entry.name, entry.path, _entry_is_dir(entry)) for entry in it]
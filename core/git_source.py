@@ -0,0 +1,109 @@
+import os
+import subprocess
+import threading
+
+INDEX_REVISION = ""
+HEAD_REVISION = "HEAD"
+GITLINK_MODE = "160000"
+
+_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+def _run_git(folder, *args):
+    return subprocess.run(
+        ["git", *args], cwd=folder, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        check=True, creationflags=_NO_WINDOW
+    ).stdout
+
+
+class GitRepository:
+    def __init__(self, folder, root):
+        self.folder = folder
+        self.root = root
+
+    @classmethod
+    def discover(cls, folder):
+        try:
+            output = _run_git(folder, "rev-parse", "--show-toplevel")
+        except (OSError, subprocess.CalledProcessError):
+            return None
+        root = output.decode("utf-8", errors="replace").strip()
+        return cls(os.path.normpath(folder), os.path.normpath(root)) if root else None
+
+    def list_files(self, revision=None):
+        if revision:
+            output = _run_git(self.folder, "ls-tree", "-r", "-z", revision)
+        else:
+            output = _run_git(self.folder, "ls-files", "-z", "--stage")
+        entries = {}
+        for record in output.decode("utf-8", errors="surrogateescape").split("\0"):
+            if not record:
+                continue
+            meta, _, name = record.partition("\t")
+            entries.setdefault(name, meta.split(" ", 1)[0])
+        return list(entries.items())
+
+    def build_listing(self, entries):
+        listing = {self.folder: []}
+        submodules = []
+        for rel_path, mode in entries:
+            parts = rel_path.split("/")
+            parent = self.folder
+            for depth, name in enumerate(parts):
+                full_path = os.path.join(parent, name)
+                is_dir = depth < len(parts) - 1
+                if is_dir and full_path in listing:
+                    parent = full_path
+                    continue
+                if not is_dir and mode == GITLINK_MODE:
+                    listing.setdefault(parent, []).append((name, full_path, True))
+                    submodules.append(full_path)
+                    break
+                listing.setdefault(parent, []).append((name, full_path, is_dir))
+                if is_dir:
+                    listing[full_path] = []
+                parent = full_path
+        return listing, submodules
+
+    def relative_path(self, file_path):
+        rel = os.path.relpath(file_path, self.folder)
+        return rel.replace(os.sep, "/")
+
+    def read_blobs(self, file_paths, revision=HEAD_REVISION):
+        process = subprocess.Popen(
+            ["git", "cat-file", "--batch"], cwd=self.folder, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL, creationflags=_NO_WINDOW
+        )
+        file_paths = list(file_paths)
+        requests = [path for path in file_paths if "\n" not in path]
+
+        def feed():
+            try:
+                for path in requests:
+                    process.stdin.write(f"{revision}:./{self.relative_path(path)}\n".encode("utf-8", "surrogateescape"))
+                process.stdin.close()
+            except OSError:
+                pass
+
+        writer = threading.Thread(target=feed, daemon=True)
+        writer.start()
+        try:
+            for path in file_paths:
+                if "\n" in path:
+                    yield path, None
+                    continue
+                header = process.stdout.readline()
+                if not header:
+                    break
+                if header.rstrip(b"\n").endswith(b" missing"):
+                    yield path, None
+                    continue
+                _, kind, size = header.split()
+                data = process.stdout.read(int(size))
+                process.stdout.read(1)
+                yield path, data if kind == b"blob" else None
+        finally:
+            process.stdout.close()
+            process.kill()
+            process.wait()
+            writer.join()
@@ -0,0 +1,221 @@
+import os
+import re
+import threading
+from collections import namedtuple
+
+GITIGNORE_FILE = ".gitignore"
+
+BUILTIN_IGNORE_PATTERNS = ["*[eE][gG][gG]-[iI][nN][fF][oO]/"]
+
+IgnoreContext = namedtuple("IgnoreContext", ["chain", "use_gitignore"])
+
+POSIX_CLASSES = {
+    "alnum": "a-zA-Z0-9",
+    "alpha": "a-zA-Z",
+    "blank": " \\t",
+    "cntrl": "\\x00-\\x1f\\x7f",
+    "digit": "0-9",
+    "graph": "\\x21-\\x7e",
+    "lower": "a-z",
+    "print": "\\x20-\\x7e",
+    "punct": re.escape("!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"),
+    "space": " \\t\\n\\r\\f\\v",
+    "upper": "A-Z",
+    "xdigit": "0-9A-Fa-f",
+}
+
+
+def _translate_bracket(pattern, i):
+    n = len(pattern)
+    j = i + 1
+    negate = j < n and pattern[j] in '!^'
+    if negate:
+        j += 1
+    parts = []
+    first = True
+    while j < n:
+        c = pattern[j]
+        if c == ']' and not first:
+            break
+        first = False
+        if pattern.startswith('[:', j):
+            end = pattern.find(':]', j + 2)
+            if end != -1:
+                name = pattern[j + 2:end]
+                if name not in POSIX_CLASSES:
+                    raise ValueError(f"unknown character class [:{name}:]")
+                parts.append(POSIX_CLASSES[name])
+                j = end + 2
+                continue
+        if c == '\\' and j + 1 < n:
+            parts.append(re.escape(pattern[j + 1]))
+            j += 2
+            continue
+        parts.append(c if c == '-' else re.escape(c))
+        j += 1
+    else:
+        return None, i
+    return ('[^/' if negate else '[') + ''.join(parts) + ']', j + 1
+
+
+def _translate_glob(pattern):
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**', i):
+                if i + 2 < n and pattern[i + 2] == '/':
+                    parts.append('(?:.*/)?')
+                    i += 3
+                else:
+                    parts.append('.*')
+                    i += 2
+                continue
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            bracket, end = _translate_bracket(pattern, i)
+            if bracket is None:
+                parts.append(re.escape(c))
+            else:
+                parts.append(bracket)
+                i = end
+                continue
+        elif c == '\\' and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return ''.join(parts)
+
+
+def parse_rule(line):
+    line = line.rstrip('\r\n')
+    if not line or line.startswith('#'):
+        return None
+    line = re.sub(r'(?<!\\) +$', '', line)
+
+    negate = line.startswith('!')
+    if negate:
+        line = line[1:]
+    elif line.startswith('\\!') or line.startswith('\\#'):
+        line = line[1:]
+
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+
+    anchored = '/' in line
+    regex = _translate_glob(line.lstrip('/'))
+    if not anchored:
+        regex = '(?:.*/)?' + regex
+    try:
+        re.compile(regex)
+    except re.error as e:
+        raise ValueError(f"invalid pattern {line!r}: {e}")
+    return regex, negate, dir_only
+
+
+def settings_pattern(entry):
+    entry = entry.strip()
+    if any(c in entry for c in '*?[/!'):
+        return entry
+    return entry + '/'
+
+
+class IgnoreMatcher:
+    def __init__(self, patterns):
+        rules = []
+        self.invalid = []
+        for pattern in patterns:
+            try:
+                rule = parse_rule(pattern)
+            except ValueError:
+                self.invalid.append(pattern)
+                continue
+            if rule is not None:
+                rules.append(rule)
+        self._dir_regex, self._dir_negated = self._compile(rules)
+        self._file_regex, self._file_negated = self._compile([rule for rule in rules if not rule[2]])
+
+    def __bool__(self):
+        return self._dir_regex is not None
+
+    @staticmethod
+    def _compile(rules):
+        if not rules:
+            return None, []
+        ordered = list(reversed(rules))
+        regex = re.compile('|'.join(f'({rule[0]})' for rule in ordered), re.DOTALL)
+        return regex, [rule[1] for rule in ordered]
+
+    def match(self, rel_path, is_dir):
+        regex, negated = (self._dir_regex, self._dir_negated) if is_dir else (self._file_regex, self._file_negated)
+        if regex is None:
+            return None
+        m = regex.fullmatch(rel_path)
+        if m is None:
+            return None
+        return not negated[m.lastindex - 1]
+
+
+def _relative(base, path):
+    rel = path[len(base):]
+    if os.sep != '/':
+        rel = rel.replace(os.sep, '/')
+    return rel.lstrip('/')
+
+
+class IgnoreEngine:
+    def __init__(self, patterns):
+        self.patterns = list(patterns)
+        self.base_matcher = IgnoreMatcher([settings_pattern(p) for p in self.patterns if p.strip()]
+                                          + BUILTIN_IGNORE_PATTERNS)
+        self._gitignore_cache = {}
+        self._lock = threading.Lock()
+
+    @property
+    def invalid_patterns(self):
+        return self.base_matcher.invalid
+
+    def root_context(self, root, use_gitignore=True):
+        return IgnoreContext(((os.path.normpath(root), self.base_matcher),), use_gitignore)
+
+    def child_context(self, context, folder, names, load=None):
+        if not context.use_gitignore or GITIGNORE_FILE not in names:
+            return context
+        matcher = (load or self.load_gitignore)(os.path.join(folder, GITIGNORE_FILE))
+        if not matcher:
+            return context
+        return context._replace(chain=context.chain + ((folder, matcher),))
+
+    def load_gitignore(self, path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            cached = self._gitignore_cache.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                matcher = IgnoreMatcher(f.read().splitlines())
+        except OSError:
+            return None
+        with self._lock:
+            self._gitignore_cache[path] = (key, matcher)
+        return matcher
+
+    def is_ignored(self, context, path, is_dir):
+        for base, matcher in reversed(context.chain):
+            verdict = matcher.match(_relative(base, path), is_dir)
+            if verdict is not None:
+                return verdict
+        return False
@@ -0,0 +1,110 @@
+import itertools
+
+_section_ids = itertools.count(1)
+
+
+def text_length(text):
+    return len(text.encode('utf-16-le')) // 2
+
+
+class MergeSection:
+    def __init__(self, path, kind, raw_content, block, source="filesystem", mtime_ns=None, size=None):
+        self.id = next(_section_ids)
+        self.path = path
+        self.kind = kind
+        self.raw_content = raw_content
+        self.block = block
+        self.line_count = block.count("\n") + 1
+        self.source = source
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.listing = None
+        self.use_gitignore = True
+        self.separator = ""
+        self.edited = False
+        self.length = text_length(self.text)
+
+    @property
+    def text(self):
+        return self.separator + self.block + "\n"
+
+    def set_separator(self, separator):
+        self.separator = separator
+        self.length = text_length(self.text)
+
+    def adopt_text(self, text):
+        if self.separator and text.startswith(self.separator):
+            text = text[len(self.separator):]
+        else:
+            self.separator = ""
+        self.block = text[:-1] if text.endswith("\n") else text
+        self.line_count = self.block.count("\n") + 1
+        self.edited = False
+        self.length = text_length(self.text)
+
+
+class MergeSession:
+    def __init__(self):
+        self.sections = []
+        self.prefix_length = 0
+        self.synced = True
+
+    def reset(self, prefix_length=0):
+        self.sections = []
+        self.prefix_length = prefix_length
+        self.synced = True
+
+    def __len__(self):
+        return len(self.sections)
+
+    def end(self):
+        return self.prefix_length + sum(section.length for section in self.sections)
+
+    def span(self, index):
+        start = self.prefix_length + sum(section.length for section in self.sections[:index])
+        return start, start + self.sections[index].length
+
+    def index_of(self, section_id):
+        for index, section in enumerate(self.sections):
+            if section.id == section_id:
+                return index
+        raise KeyError(section_id)
+
+    def index_at(self, position):
+        start = self.prefix_length
+        for index, section in enumerate(self.sections):
+            end = start + section.length
+            if start <= position < end:
+                return index
+            start = end
+        return None
+
+    def extend(self, sections):
+        self.sections.extend(sections)
+
+    def replace(self, index, section):
+        section.set_separator(self.sections[index].separator)
+        self.sections[index] = section
+
+    def remove(self, index):
+        return self.sections.pop(index)
+
+    def move(self, index, new_index):
+        section = self.sections.pop(index)
+        self.sections.insert(new_index, section)
+        return section
+
+    def apply_external_edit(self, position, removed, added):
+        if not self.synced:
+            return
+        end = self.prefix_length
+        if position + removed <= end:
+            self.prefix_length += added - removed
+            return
+        for section in self.sections:
+            start, end = end, end + section.length
+            if start <= position and position + removed <= end:
+                section.length += added - removed
+                section.edited = True
+                return
+        self.synced = False
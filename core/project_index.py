@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+import zlib
+
+from core.folder_scan import scan_folder
+
+INDEX_VERSION = 2
+MAX_STORED_CONTENT = 4 * 1024 * 1024
+RACY_WINDOW_NS = 2 * 1000 * 1000 * 1000
+FLUSH_EVERY = 500
+
+
+def default_index_dir():
+    if sys.platform.startswith("win"):
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+    elif sys.platform.startswith("darwin"):
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "PixMergeTool", "index")
+
+
+def clear_indexes(index_dir=None):
+    shutil.rmtree(index_dir or default_index_dir(), ignore_errors=True)
+
+
+class ProjectIndex:
+    def __init__(self, root, index_dir=None):
+        self.root = os.path.normpath(os.path.abspath(root))
+        index_dir = index_dir or default_index_dir()
+        os.makedirs(index_dir, exist_ok=True)
+        name = hashlib.sha1(os.path.normcase(self.root).encode("utf-8", "surrogateescape")).hexdigest()
+        self.path = os.path.join(index_dir, f"{name}.sqlite3")
+
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self._db.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or int(row[0]) != INDEX_VERSION:
+            self._db.execute("DROP TABLE IF EXISTS dirs")
+            self._db.execute("DROP TABLE IF EXISTS files")
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)", (str(INDEX_VERSION),))
+            self._db.execute("INSERT OR REPLACE INTO meta VALUES ('root', ?)", (self.root,))
+        self._db.execute("CREATE TABLE IF NOT EXISTS dirs (path TEXT PRIMARY KEY, mtime_ns INTEGER, entries TEXT)")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS files (path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, "
+            "is_text INTEGER, reason TEXT, content BLOB)"
+        )
+        self._db.commit()
+
+    def _key(self, path):
+        rel = os.path.relpath(path, self.root)
+        return "" if rel == os.curdir else rel.replace(os.sep, "/")
+
+    @staticmethod
+    def _is_racy(mtime_ns):
+        return time.time_ns() - mtime_ns < RACY_WINDOW_NS
+
+    def _write(self, sql, params):
+        with self._lock:
+            self._db.execute(sql, params)
+            self._pending += 1
+            if self._pending >= FLUSH_EVERY:
+                self._db.commit()
+                self._pending = 0
+
+    def get(self, folder, default=()):
+        st = os.stat(folder)
+        key = self._key(folder)
+        with self._lock:
+            row = self._db.execute("SELECT mtime_ns, entries FROM dirs WHERE path = ?", (key,)).fetchone()
+        if row is not None and row[0] == st.st_mtime_ns:
+            return [(name, os.path.join(folder, name), is_dir) for name, is_dir in json.loads(row[1])]
+
+        entries = scan_folder(folder)
+        if not self._is_racy(st.st_mtime_ns):
+            self._write(
+                "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)",
+                (key, st.st_mtime_ns, json.dumps([[name, is_dir] for name, _, is_dir in entries]))
+            )
+        return entries
+
+    def lookup_file(self, file_path, st):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT size, mtime_ns, is_text, reason, content FROM files WHERE path = ?", (self._key(file_path),)
+            ).fetchone()
+        if row is None or row[0] != st.st_size or row[1] != st.st_mtime_ns:
+            return None
+        if not row[2]:
+            return None, row[3]
+        if row[4] is None:
+            return None
+        return zlib.decompress(row[4]).decode("utf-8"), None
+
+    def store_file(self, file_path, st, content, reason):
+        if self._is_racy(st.st_mtime_ns):
+            return
+        if content is None:
+            params = (self._key(file_path), st.st_size, st.st_mtime_ns, 0, reason, None)
+        else:
+            data = content.encode("utf-8")
+            stored = zlib.compress(data, 1) if len(data) <= MAX_STORED_CONTENT else None
+            params = (self._key(file_path), st.st_size, st.st_mtime_ns, 1, None, stored)
+        self._write("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?)", params)
+
+    def close(self):
+        with self._lock:
+            self._db.commit()
+            self._db.close()
@@ -0,0 +1,62 @@
+import csv
+import os
+from collections import namedtuple
+
+SKIPPED = "skipped"
+FAILED = "error"
+
+ReportEntry = namedtuple("ReportEntry", ["kind", "path", "reason", "size"])
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return None
+
+
+def skipped_entry(path, reason):
+    return ReportEntry(SKIPPED, path, reason, _file_size(path))
+
+
+def error_entry(error):
+    return ReportEntry(FAILED, error.path, str(error.reason), _file_size(error.path))
+
+
+class ProcessingReport:
+    def __init__(self):
+        self.entries = []
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, entry):
+        self.entries.append(entry)
+
+    def clear(self):
+        self.entries = []
+
+    def count(self, kind):
+        return sum(1 for entry in self.entries if entry.kind == kind)
+
+    def summary(self):
+        skipped = self.count(SKIPPED)
+        failed = len(self.entries) - skipped
+        parts = []
+        if skipped:
+            parts.append(f"{skipped} skipped")
+        if failed:
+            parts.append(f"{failed} failed")
+        return ", ".join(parts)
+
+    def filtered(self, text="", kind=None):
+        text = text.lower()
+        return [entry for entry in self.entries
+                if (kind is None or entry.kind == kind)
+                and (not text or text in entry.path.lower() or text in entry.reason.lower())]
+
+    def write_csv(self, path, entries=None):
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(ReportEntry._fields)
+            writer.writerows(self.entries if entries is None else entries)
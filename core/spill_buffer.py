@@ -0,0 +1,95 @@
+import bisect
+import tempfile
+import threading
+
+
+class SpillBuffer:
+    CHUNK_CHARS = 1024 * 1024
+
+    def __init__(self, threshold, directory=None):
+        self.threshold = threshold
+        self.directory = directory
+        self.length = 0
+        self._chunks = []
+        self._starts = []
+        self._memory_size = 0
+        self._file = None
+        self._file_size = 0
+        self._lock = threading.Lock()
+
+    @property
+    def spilled(self):
+        return self._file is not None
+
+    def __len__(self):
+        return self.length
+
+    def append(self, text):
+        for start in range(0, len(text), self.CHUNK_CHARS):
+            self._append_chunk(text[start:start + self.CHUNK_CHARS])
+
+    def _append_chunk(self, text):
+        self._starts.append(self.length)
+        self.length += len(text)
+        if self._file is None:
+            self._chunks.append(text)
+            self._memory_size += len(text)
+            if self._memory_size > self.threshold:
+                self._spill()
+        else:
+            self._chunks.append(self._write(text))
+
+    def _spill(self):
+        self._file = tempfile.TemporaryFile(prefix="pix-merge-", suffix=".txt", dir=self.directory)
+        self._chunks = [self._write(text) for text in self._chunks]
+        self._memory_size = 0
+
+    def _write(self, text):
+        data = text.encode('utf-8', 'surrogatepass')
+        with self._lock:
+            self._file.seek(self._file_size)
+            self._file.write(data)
+            offset = self._file_size
+            self._file_size += len(data)
+        return offset, len(data)
+
+    def _chunk_text(self, index):
+        chunk = self._chunks[index]
+        if isinstance(chunk, str):
+            return chunk
+        offset, size = chunk
+        with self._lock:
+            self._file.seek(offset)
+            data = self._file.read(size)
+        return data.decode('utf-8', 'surrogatepass')
+
+    def read(self, start, count):
+        end = min(start + count, self.length)
+        if start >= end:
+            return ""
+        index = max(bisect.bisect_right(self._starts, start) - 1, 0)
+        parts = []
+        while index < len(self._chunks) and self._starts[index] < end:
+            chunk_start = self._starts[index]
+            text = self._chunk_text(index)
+            parts.append(text[max(start - chunk_start, 0):end - chunk_start])
+            index += 1
+        return "".join(parts)
+
+    def iter_chunks(self, end=None):
+        end = self.length if end is None else min(end, self.length)
+        for index in range(len(self._chunks)):
+            start = self._starts[index]
+            if start >= end:
+                return
+            yield self._chunk_text(index)[:end - start]
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        self._chunks = []
+        self._starts = []
+        self.length = 0
+        self._memory_size = 0
+        self._file_size = 0
@@ -0,0 +1,55 @@
+import re
+
+_WORD_RE = re.compile(r"\S+")
+
+
+class TextMetrics:
+    def __init__(self, count_tokens=None):
+        self.count_tokens = count_tokens
+        self._lines = []
+        self._words = 0
+        self._chars_no_ws = 0
+        self._chars = 0
+        self._tokens = 0
+
+    def _line_stats(self, line):
+        words = sum(1 for _ in _WORD_RE.finditer(line))
+        chars = len(line)
+        chars_no_ws = chars - (line.count(" ") + line.count("\t") + line.count("\r"))
+        tokens = self.count_tokens(line) if self.count_tokens is not None and line else 0
+        return words, chars_no_ws, chars, tokens
+
+    def _add(self, stats, sign):
+        for words, chars_no_ws, chars, tokens in stats:
+            self._words += sign * words
+            self._chars_no_ws += sign * chars_no_ws
+            self._chars += sign * chars
+            self._tokens += sign * tokens
+
+    def reset(self, lines):
+        self._lines = [self._line_stats(line) for line in lines]
+        self._words = self._chars_no_ws = self._chars = self._tokens = 0
+        self._add(self._lines, 1)
+
+    def replace(self, start, stop, lines):
+        self.replace_stats(start, stop, [self._line_stats(line) for line in lines])
+
+    def replace_stats(self, start, stop, stats):
+        self._add(self._lines[start:stop], -1)
+        self._lines[start:stop] = stats
+        self._add(stats, 1)
+
+    def line_stats(self, start=0, stop=None):
+        return self._lines[start:stop]
+
+    def block_count(self):
+        return len(self._lines)
+
+    def last_line(self):
+        return self._lines[-1] if self._lines else (0, 0, 0, 0)
+
+    def totals(self):
+        block_count = len(self._lines)
+        chars = self._chars + max(block_count - 1, 0)
+        lines = block_count if chars else 0
+        return self._words, self._chars_no_ws, chars, lines, self._tokens
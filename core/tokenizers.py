@@ -0,0 +1,114 @@
+import base64
+import os
+import re
+import threading
+from collections import OrderedDict
+
+HEURISTIC_TOKENIZER = "heuristic"
+
+_HEURISTIC_RE = re.compile(r"\w+|[^\w\s]")
+_BPE_SPLIT_RE = re.compile(
+    r"'(?i:[sdmt]|ll|ve|re)|[^\r\n\w]?[^\W\d_]+|\d{1,3}| ?[^\s\w]+[\r\n]*|\s*[\r\n]+|\s+(?!\S)|\s+"
+)
+
+
+class HeuristicTokenizer:
+    name = "Heuristic estimate"
+
+    def count(self, text):
+        tokens = 0
+        for match in _HEURISTIC_RE.finditer(text):
+            length = match.end() - match.start()
+            tokens += (length + 3) // 4 if length > 1 else 1
+        return tokens
+
+
+class BpeTokenizer:
+    PIECE_CACHE_SIZE = 65536
+
+    def __init__(self, vocab_path):
+        self.vocab_path = vocab_path
+        self.name = os.path.splitext(os.path.basename(vocab_path))[0]
+        self.ranks = self._load_ranks(vocab_path)
+        self._piece_cache = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load_ranks(vocab_path):
+        ranks = {}
+        with open(vocab_path, 'rb') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) != 2:
+                    continue
+                ranks[base64.b64decode(parts[0])] = int(parts[1])
+        if not ranks:
+            raise ValueError(f"No BPE ranks found in {vocab_path}")
+        return ranks
+
+    def _count_piece(self, piece):
+        if piece in self.ranks:
+            return 1
+        parts = [piece[i:i + 1] for i in range(len(piece))]
+        while len(parts) > 1:
+            best_rank = None
+            best_index = -1
+            for i in range(len(parts) - 1):
+                rank = self.ranks.get(parts[i] + parts[i + 1])
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank = rank
+                    best_index = i
+            if best_rank is None:
+                break
+            parts[best_index:best_index + 2] = [parts[best_index] + parts[best_index + 1]]
+        return len(parts)
+
+    def count(self, text):
+        tokens = 0
+        cache = self._piece_cache
+        for match in _BPE_SPLIT_RE.finditer(text):
+            piece = match.group()
+            count = cache.get(piece)
+            if count is None:
+                count = self._count_piece(piece.encode('utf-8'))
+                with self._lock:
+                    if len(cache) >= self.PIECE_CACHE_SIZE:
+                        cache.clear()
+                    cache[piece] = count
+            tokens += count
+        return tokens
+
+
+def load_tokenizer(spec):
+    if not spec or spec == HEURISTIC_TOKENIZER:
+        return HeuristicTokenizer()
+    return BpeTokenizer(spec)
+
+
+class TokenCounter:
+    CACHE_SIZE = 8192
+
+    def __init__(self, tokenizer=None):
+        self.tokenizer = tokenizer or HeuristicTokenizer()
+        self._lines = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set_tokenizer(self, tokenizer):
+        with self._lock:
+            self.tokenizer = tokenizer
+            self._lines.clear()
+
+    def count_line(self, line):
+        with self._lock:
+            count = self._lines.get(line)
+            if count is not None:
+                self._lines.move_to_end(line)
+                return count
+            tokenizer = self.tokenizer
+        count = tokenizer.count(line)
+        with self._lock:
+            if tokenizer is self.tokenizer:
+                self._lines[line] = count
+                if len(self._lines) > self.CACHE_SIZE:
+                    self._lines.popitem(last=False)
+        return count
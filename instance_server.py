@@ -0,0 +1,99 @@
+import getpass
+import hashlib
+import json
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+CONNECT_TIMEOUT_MS = 500
+MAX_MESSAGE_BYTES = 16 * 1024 * 1024
+
+
+def server_name():
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = ""
+    return "PixMergeTool-" + hashlib.sha1(user.encode('utf-8')).hexdigest()[:12]
+
+
+def _connect(name):
+    socket = QLocalSocket()
+    socket.connectToServer(name)
+    if socket.waitForConnected(CONNECT_TIMEOUT_MS):
+        return socket
+    return None
+
+
+def forward_to_running_instance(paths):
+    socket = _connect(server_name())
+    if socket is None:
+        return False
+    data = json.dumps(paths).encode('utf-8')
+    if socket.write(data) != len(data):
+        socket.abort()
+        return False
+    socket.flush()
+    while socket.bytesToWrite() > 0:
+        if not socket.waitForBytesWritten(CONNECT_TIMEOUT_MS):
+            socket.abort()
+            return False
+    socket.disconnectFromServer()
+    if socket.state() != QLocalSocket.UnconnectedState:
+        socket.waitForDisconnected(CONNECT_TIMEOUT_MS)
+    return True
+
+
+class InstanceServer(QObject):
+    paths_received = Signal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self._on_new_connection)
+        self._buffers = {}
+
+    def listen(self):
+        name = server_name()
+        if self.server.listen(name):
+            return True
+        probe = _connect(name)
+        if probe is not None:
+            probe.abort()
+            return False
+        QLocalServer.removeServer(name)
+        return self.server.listen(name)
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self._buffers[socket] = bytearray()
+            socket.readyRead.connect(lambda s=socket: self._on_ready_read(s))
+            socket.disconnected.connect(lambda s=socket: self._on_disconnected(s))
+            if socket.state() == QLocalSocket.UnconnectedState:
+                self._on_disconnected(socket)
+            elif socket.bytesAvailable():
+                self._on_ready_read(socket)
+
+    def _on_ready_read(self, socket):
+        buffer = self._buffers.get(socket)
+        if buffer is None:
+            return
+        buffer += bytes(socket.readAll())
+        if len(buffer) > MAX_MESSAGE_BYTES:
+            del self._buffers[socket]
+            socket.abort()
+
+    def _on_disconnected(self, socket):
+        self._on_ready_read(socket)
+        buffer = self._buffers.pop(socket, None)
+        socket.deleteLater()
+        if buffer is None:
+            return
+        try:
+            paths = json.loads(buffer.decode('utf-8'))
+        except ValueError:
+            return
+        if isinstance(paths, list):
+            self.paths_received.emit([path for path in paths if isinstance(path, str)])
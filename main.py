@@ -1,16 +1,32 @@
+import os
 import sys
 import ctypes
-from PySide6.QtWidgets import QApplication
-from PySide6.QtGui import QIcon
 
-from views import MainWindow
-from presenters import MainPresenter
-from models import SettingsManager
-from resources import resources_rc
+from instance_server import InstanceServer, forward_to_running_instance
+
+
+NEW_INSTANCE_FLAG = "--new-instance"
 
 
 def main():
+    arguments = sys.argv[1:]
+    paths = [os.path.abspath(arg) for arg in arguments if arg != NEW_INSTANCE_FLAG and os.path.exists(arg)]
+    single_instance = NEW_INSTANCE_FLAG not in arguments
+    if single_instance and forward_to_running_instance(paths):
+        return
+
+    from PySide6.QtWidgets import QApplication
     app = QApplication(sys.argv)
+    instance_server = None
+    if single_instance:
+        instance_server = InstanceServer(app)
+        instance_server.listen()
+
+    from PySide6.QtGui import QIcon
+    from views import MainWindow
+    from presenters import MainPresenter
+    from models import SettingsManager
+    from resources import resources_rc
 
     if sys.platform.startswith("win"):
         icon_path = ":/resources/icons/icon.ico"
@@ -31,6 +47,11 @@ def main():
     app.aboutToQuit.connect(lambda: settings_manager.save(window))
 
     window.show()
+
+    if instance_server is not None:
+        instance_server.paths_received.connect(presenter.open_paths)
+    if paths:
+        presenter.open_paths(paths)
     sys.exit(app.exec())
 
 
@@ -1,3 +1,2 @@
-from models.file_processor import FileProcessor
 from models.settings_manager import SettingsManager
 from models.markdown_highlighter import MarkdownHighlighter
\ No newline at end of file
@@ -0,0 +1,112 @@
+import os
+
+from PySide6.QtCore import QAbstractListModel, QModelIndex, Qt
+
+
+def format_size(size):
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+
+class SectionListModel(QAbstractListModel):
+    SectionRole = Qt.UserRole + 1
+    CollapsedRole = Qt.UserRole + 2
+    MetricsRole = Qt.UserRole + 3
+
+    def __init__(self, session, request_metrics=None, parent=None):
+        super().__init__(parent)
+        self.session = session
+        self.request_metrics = request_metrics
+        self._collapsed = set()
+        self._metrics = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.session.sections)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.session.sections):
+            return None
+        section = self.session.sections[index.row()]
+        if role == Qt.DisplayRole:
+            return self.header_text(section)
+        if role == Qt.ToolTipRole:
+            return section.path
+        if role == self.SectionRole:
+            return section
+        if role == self.CollapsedRole:
+            return section.id in self._collapsed
+        if role == self.MetricsRole:
+            return self.metrics(section)
+        return None
+
+    def header_text(self, section):
+        name = os.path.basename(os.path.normpath(section.path)) or section.path
+        size = section.size if section.size is not None else len(section.block)
+        metrics = self.metrics(section)
+        tokens = f"{metrics[4]} tokens" if metrics is not None else "counting tokens..."
+        kind = "tree" if section.kind == 'tree' else format_size(size)
+        return f"{name}  ·  {kind}  ·  {section.line_count} lines  ·  {tokens}"
+
+    def metrics(self, section):
+        metrics = self._metrics.get(section.id)
+        if metrics is None and self.request_metrics is not None:
+            self._metrics[section.id] = False
+            self.request_metrics(section, self.set_metrics)
+        return metrics or None
+
+    def set_metrics(self, section_id, totals):
+        if section_id not in self._metrics:
+            return
+        self._metrics[section_id] = totals
+        try:
+            row = self.session.index_of(section_id)
+        except KeyError:
+            return
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def invalidate_metrics(self):
+        self._metrics.clear()
+        if self.session.sections:
+            self.dataChanged.emit(self.index(0), self.index(len(self.session.sections) - 1))
+
+    def totals(self):
+        totals = [0, 0, 0, 0, 0]
+        measured = 0
+        for section in self.session.sections:
+            metrics = self.metrics(section)
+            if metrics is not None:
+                totals = [a + b for a, b in zip(totals, metrics)]
+                measured += 1
+        if measured:
+            totals[3] -= measured - 1
+        return tuple(totals)
+
+    def toggle_collapsed(self, row):
+        section = self.session.sections[row]
+        self._collapsed ^= {section.id}
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def set_all_collapsed(self, collapsed):
+        if collapsed:
+            self._collapsed = {section.id for section in self.session.sections}
+        else:
+            self._collapsed.clear()
+        self.sections_changed()
+
+    def append_sections(self, sections):
+        total = len(self.session.sections)
+        self.beginInsertRows(QModelIndex(), total, total + len(sections) - 1)
+        self.session.extend(sections)
+        self.endInsertRows()
+
+    def sections_changed(self, stale_ids=()):
+        self.beginResetModel()
+        ids = {section.id for section in self.session.sections}
+        self._collapsed &= ids
+        self._metrics = {key: value for key, value in self._metrics.items() if key in ids and key not in stale_ids}
+        self.endResetModel()
@@ -1,5 +1,7 @@
 from PySide6.QtCore import QSettings
 
+from core.file_processor import DEFAULT_TREE_LIMITS
+
 
 class SettingsManager:
     def __init__(self):
@@ -43,6 +45,14 @@ class SettingsManager:
         self._save_value("show_ignored", ui.action_show_ignored.isChecked())
         self._save_value("add_language", ui.action_add_language.isChecked())
         self._save_value("append_mode", ui.action_append.isChecked())
+        if hasattr(view, "action_folder_contents"):
+            self._save_value("folder_contents", view.action_folder_contents.isChecked())
+        if hasattr(view, "action_use_gitignore"):
+            self._save_value("use_gitignore", view.action_use_gitignore.isChecked())
+        if hasattr(view, "folder_source_actions"):
+            self._save_value("folder_source", view.folder_source())
+        if hasattr(view, "action_use_index"):
+            self._save_value("project_index_enabled", view.action_use_index.isChecked())
 
         if hasattr(view, 'splitter') and ui.checkBox_prompt.isChecked():
             self._save_value("splitter_state", view.splitter.saveState())
@@ -108,6 +118,14 @@ class SettingsManager:
         ui.action_show_ignored.setChecked(self._load_value("show_ignored", True, bool))
         ui.action_add_language.setChecked(self._load_value("add_language", True, bool))
         ui.action_append.setChecked(self._load_value("append_mode", False, bool))
+        if hasattr(view, "action_folder_contents"):
+            view.action_folder_contents.setChecked(self._load_value("folder_contents", False, bool))
+        if hasattr(view, "action_use_gitignore"):
+            view.action_use_gitignore.setChecked(self._load_value("use_gitignore", True, bool))
+        if hasattr(view, "folder_source_actions"):
+            view.set_folder_source(self._load_value("folder_source", "filesystem", str))
+        if hasattr(view, "action_use_index"):
+            view.action_use_index.setChecked(self._load_value("project_index_enabled", False, bool))
 
         if hasattr(view, 'splitter'):
             if prompt_enabled:
@@ -147,6 +165,31 @@ class SettingsManager:
         else:
             return default
 
+    def save_tree_limits(self, limits):
+        for key, value in limits.items():
+            self._save_value(key, value)
+
+    def load_tree_limits(self):
+        return {key: self._load_value(key, value, int) for key, value in DEFAULT_TREE_LIMITS.items()}
+
+    def save_content_cache_mb(self, size_mb):
+        self._save_value("content_cache_mb", size_mb)
+
+    def load_content_cache_mb(self):
+        return self._load_value("content_cache_mb", 256, int)
+
+    def save_spill_threshold_mb(self, size_mb):
+        self._save_value("spill_threshold_mb", size_mb)
+
+    def load_spill_threshold_mb(self):
+        return self._load_value("spill_threshold_mb", 64, int)
+
+    def save_tokenizer(self, spec):
+        self._save_value("tokenizer", spec)
+
+    def load_tokenizer(self):
+        return self._load_value("tokenizer", "heuristic", str)
+
     def save_window_state(self, window):
         self._save_value("window_geometry", window.saveGeometry())
         self._save_value("window_state", window.saveState())
@@ -0,0 +1,50 @@
+from PySide6.QtCore import QMimeData
+
+from core.merge_session import MergeSection
+from core.spill_buffer import SpillBuffer
+
+TEXT_FORMAT = "text/plain"
+
+
+class LazyTextMimeData(QMimeData):
+    def __init__(self, parts):
+        super().__init__()
+        self.parts = []
+        for part in parts:
+            if isinstance(part, MergeSection):
+                self.parts += [part.separator, part.block, "\n"]
+            elif isinstance(part, SpillBuffer):
+                self.parts.append((part, len(part)))
+            else:
+                self.parts.append(part)
+        self._text = None
+
+    def formats(self):
+        return [TEXT_FORMAT]
+
+    def hasFormat(self, mime_type):
+        return mime_type == TEXT_FORMAT
+
+    def hasText(self):
+        return True
+
+    def text(self):
+        if self._text is None:
+            pieces = []
+            for part in self.parts:
+                if isinstance(part, tuple):
+                    buffer, length = part
+                    pieces.extend(buffer.iter_chunks(length))
+                else:
+                    pieces.append(part)
+            self._text = "".join(pieces)
+            self.parts = []
+        return self._text
+
+    def retrieveData(self, mime_type, preferred_type):
+        if mime_type != TEXT_FORMAT:
+            return super().retrieveData(mime_type, preferred_type)
+        return self.text()
+
+    def adopt(self, buffer):
+        return self._text is None and any(isinstance(part, tuple) and part[0] is buffer for part in self.parts)
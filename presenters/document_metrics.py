@@ -0,0 +1,133 @@
+from core.text_metrics import TextMetrics
+
+
+class DocumentMetrics:
+    BULK_THRESHOLD = 64 * 1024
+
+    def __init__(self, document, count_tokens=None, worker=None, on_updated=None):
+        self.document = document
+        self.count_tokens = count_tokens
+        self.worker = worker
+        self.on_updated = on_updated
+        self.model = TextMetrics(count_tokens)
+        self.revision = 0
+        self._dirty = True
+        self._last_totals = (0, 0, 0, 0, 0)
+        self._stale = None
+        self._requested = None
+        self._touched = None
+        document.contentsChange.connect(self._on_contents_change)
+
+    def invalidate(self):
+        self.revision += 1
+        self._dirty = True
+        self._stale = None
+
+    def _iter_block_texts(self, first=0, last=None):
+        block = self.document.findBlockByNumber(first)
+        while block.isValid() and (last is None or block.blockNumber() <= last):
+            yield block.text()
+            block = block.next()
+
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        self.revision += 1
+        if self.document.isEmpty():
+            self.model = TextMetrics(self.count_tokens)
+            self.model.reset([""])
+            self._dirty = False
+            self._stale = None
+            return
+        if self._dirty:
+            return
+        bulk = chars_removed + chars_added > self.BULK_THRESHOLD
+        if bulk and chars_removed:
+            self._dirty = True
+            self._stale = None
+            return
+
+        document = self.document
+        block_count = document.blockCount()
+        first = document.findBlock(position).blockNumber()
+        last = document.findBlock(position + chars_added).blockNumber()
+        if last < 0:
+            last = block_count - 1
+        old_last = last - (block_count - self.model.block_count())
+        if first < 0 or old_last < first - 1 or old_last >= self.model.block_count():
+            self._dirty = True
+            self._stale = None
+            return
+        self._touched = first if self._touched is None else min(self._touched, first)
+        self._shift_stale(first, old_last, last)
+        if not bulk:
+            self.model.replace(first, old_last + 1, self._iter_block_texts(first, last))
+            return
+        self.model.replace_stats(first, old_last + 1, [(0, 0, 0, 0)] * (last - first + 1))
+        lo, hi = self._stale or (first, last + 1)
+        self._stale = (min(lo, first), max(hi, last + 1))
+        self._request_stale()
+
+    def _shift_stale(self, first, old_last, last):
+        if self._stale is None:
+            return
+        lo, hi = self._stale
+        delta = last - old_last
+        if old_last < lo:
+            self._stale = (lo + delta, hi + delta)
+        elif first < hi:
+            self._stale = (min(lo, first), max(hi + delta, last + 1))
+
+    def _request_stale(self):
+        if self.worker is None:
+            lo, hi = self._stale
+            self.model.replace(lo, hi, self._iter_block_texts(lo, hi - 1))
+            self._stale = None
+            return
+        self.worker.request((id(self), "stale"), self._snapshot_stale, self._on_stale_counted)
+
+    def _snapshot_stale(self):
+        self._requested = self._stale
+        self._touched = None
+        if self._stale is None:
+            return self.revision, "", 0
+        lo, hi = self._stale
+        return self.revision, "\u2029".join(self._iter_block_texts(lo, hi - 1)), hi - lo
+
+    def _on_stale_counted(self, revision, counted):
+        if self._dirty or self._stale is None or self._requested is None:
+            return
+        lo, hi = self._requested
+        valid = hi if self._touched is None else min(hi, self._touched)
+        stale_lo, stale_hi = self._stale
+        if valid > lo:
+            self.model.replace_stats(lo, valid, counted.line_stats(0, valid - lo))
+            stale_lo = max(stale_lo, valid)
+        self._stale = (stale_lo, stale_hi) if stale_lo < stale_hi else None
+        self._requested = None
+        if self._stale is not None:
+            self._request_stale()
+        elif self.on_updated is not None:
+            self.on_updated()
+
+    def _snapshot(self):
+        return self.revision, self.document.toRawText(), self.document.blockCount()
+
+    def _on_recount_done(self, revision, model):
+        if revision != self.revision or not self._dirty:
+            return
+        self.model = model
+        self._dirty = False
+        self._stale = None
+        if self.on_updated is not None:
+            self.on_updated()
+
+    def totals(self):
+        if self._dirty:
+            if self.worker is None:
+                self.model = TextMetrics(self.count_tokens)
+                self.model.reset(self._iter_block_texts())
+                self._dirty = False
+            else:
+                self.worker.request(id(self), self._snapshot, self._on_recount_done)
+                return self._last_totals
+        self._last_totals = self.model.totals()
+        return self._last_totals
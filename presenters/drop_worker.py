@@ -0,0 +1,73 @@
+import threading
+import time
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+from core import FileProcessor, MergeError
+from core.report import error_entry, skipped_entry
+
+
+class DropWorker(QObject):
+    progress = Signal(int, int, str)
+    batch_ready = Signal(object)
+    issue = Signal(object)
+    finished = Signal(bool)
+
+    BATCH_INTERVAL = 0.1
+    BATCH_MAX_CHARS = 256 * 1024
+
+    def __init__(self, paths, settings, ignore_engine):
+        super().__init__()
+        self.paths = list(paths)
+        self.settings = dict(settings)
+        self._cancel_event = threading.Event()
+        self.processor = FileProcessor(
+            ignore_engine=ignore_engine,
+            on_error=lambda error: self.issue.emit(error_entry(error)),
+            on_skip=lambda path, reason: self.issue.emit(skipped_entry(path, reason)),
+            cancel_event=self._cancel_event
+        )
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    @Slot()
+    def run(self):
+        total = len(self.paths)
+        if FileProcessor.expands_folders(self.settings):
+            total = 0
+        pending = []
+        pending_size = 0
+        last_flush = last_progress = time.monotonic()
+        path = self.paths[0] if self.paths else ""
+
+        self.progress.emit(0, total, path)
+        try:
+            for index, (path, section) in enumerate(self.processor.process_many_sections(self.paths, self.settings)):
+                if self.is_cancelled():
+                    break
+
+                if section is not None:
+                    pending.append(section)
+                    pending_size += section.length
+
+                now = time.monotonic()
+                if now - last_progress >= self.BATCH_INTERVAL:
+                    self.progress.emit(index + 1, total, path)
+                    last_progress = now
+                if pending and (now - last_flush >= self.BATCH_INTERVAL or pending_size >= self.BATCH_MAX_CHARS):
+                    self.batch_ready.emit(pending)
+                    pending = []
+                    pending_size = 0
+                    last_flush = now
+        except Exception as e:
+            self.issue.emit(error_entry(MergeError(path, e)))
+        finally:
+            if pending:
+                self.batch_ready.emit(pending)
+            if not self.is_cancelled() and total:
+                self.progress.emit(total, total, "")
+            self.finished.emit(self.is_cancelled())
@@ -0,0 +1,65 @@
+import os
+import threading
+
+from PySide6.QtCore import QObject, Signal, Slot
+
+from core.merge_session import MergeSection
+from core.spill_buffer import SpillBuffer
+
+
+def iter_text_parts(parts):
+    for part in parts:
+        if isinstance(part, MergeSection):
+            if part.separator:
+                yield part.separator
+            yield part.block
+            yield "\n"
+        elif isinstance(part, SpillBuffer):
+            yield from part.iter_chunks()
+        elif part:
+            yield part
+
+
+class ExportWorker(QObject):
+    progress = Signal(int, int, str)
+    finished = Signal(bool, str)
+
+    PROGRESS_INTERVAL = 4 * 1024 * 1024
+
+    def __init__(self, path, parts, total):
+        super().__init__()
+        self.path = path
+        self.parts = parts
+        self.total = total
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    @Slot()
+    def run(self):
+        partial_path = self.path + ".part"
+        written = 0
+        reported = 0
+        try:
+            with open(partial_path, 'w', encoding='utf-8') as f:
+                for chunk in iter_text_parts(self.parts):
+                    if self._cancel_event.is_set():
+                        break
+                    f.write(chunk)
+                    written += len(chunk)
+                    if written - reported >= self.PROGRESS_INTERVAL:
+                        reported = written
+                        self.progress.emit(written // 1024, self.total // 1024, self.path)
+            if self._cancel_event.is_set():
+                os.remove(partial_path)
+            else:
+                os.replace(partial_path, self.path)
+        except Exception as e:
+            try:
+                os.remove(partial_path)
+            except OSError:
+                pass
+            self.finished.emit(False, f"Error saving file: {e}")
+            return
+        self.finished.emit(self._cancel_event.is_set(), "")
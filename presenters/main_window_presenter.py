@@ -1,27 +1,79 @@
 import os
-import re
 
-from PySide6.QtCore import QTimer
-from PySide6.QtWidgets import QMessageBox, QFileDialog, QApplication, QDialog
-
-from views import AboutWindow, IgnoredFoldersDialog
-from models import FileProcessor, SettingsManager
+from PySide6.QtCore import QTimer, QThread
+from PySide6.QtGui import QTextCursor
+from PySide6.QtWidgets import QMessageBox, QFileDialog, QApplication, QDialog, QInputDialog
+
+from views import AboutWindow, IgnoredFoldersDialog, ProcessingReportDialog, TreeLimitsDialog
+from core import FileProcessor
+from core.file_processor import CONTENT_CACHE
+from core.merge_session import MergeSection, MergeSession
+from core.spill_buffer import SpillBuffer
+from core.tokenizers import HEURISTIC_TOKENIZER, TokenCounter, load_tokenizer
+from core.project_index import clear_indexes
+from core.report import ProcessingReport
+from models import SettingsManager
+from models.section_list_model import SectionListModel
+from presenters.clipboard_data import LazyTextMimeData
+from presenters.document_metrics import DocumentMetrics
+from presenters.drop_worker import DropWorker
+from presenters.export_worker import ExportWorker, iter_text_parts
+from presenters.metrics_worker import MetricsWorker
 
 
 class MainPresenter:
+    SPILL_PAGE_CHARS = 512 * 1024
+
     def __init__(self, view):
         self.view = view
         self.view.presenter = self
-        self.processor = FileProcessor()
+        self.processor = FileProcessor(ignored_dirs=SettingsManager().load_ignored_folders(),
+                                       on_error=self._show_processing_error)
         self.previous_splitter_sizes = None
+        self.tree_limits = SettingsManager().load_tree_limits()
+        CONTENT_CACHE.set_budget(SettingsManager().load_content_cache_mb() * 1024 * 1024)
+
+        self._drop_thread = None
+        self._drop_worker = None
+        self._drop_needs_separator = False
+        self._pending_paths = []
+        self._export_thread = None
+        self._export_worker = None
+        self.report = ProcessingReport()
+        self._report_dialog = None
+        self.merge_session = MergeSession()
+        self.spill_threshold_mb = SettingsManager().load_spill_threshold_mb()
+        self._spill = None
+        self._spill_page = 0
+        self._spill_generation = 0
+        self._spill_totals = (0, 0, 0, 0, 0)
+        self._spill_tail = ""
+        self._spill_last_line = (0, 0, 0, 0)
+        self._session_edit = False
+        self._rerender_timer = QTimer(self.view)
+        self._rerender_timer.setSingleShot(True)
+        self._rerender_timer.setInterval(0)
+        self._rerender_timer.timeout.connect(self.rerender_sections)
 
         self._metrics_timer = QTimer(self.view)
         self._metrics_timer.setSingleShot(True)
         self._metrics_timer.setInterval(150)
         self._metrics_timer.timeout.connect(self._recompute_metrics)
-        self._word_re = re.compile(r"\S+")
+        self.token_counter = TokenCounter()
+        self.tokenizer_spec = HEURISTIC_TOKENIZER
+        self._metrics_worker = MetricsWorker(self.token_counter.count_line, self.view)
+        self._prompt_metrics = DocumentMetrics(self.view.ui.textEdit_prompt.document(),
+                                               self.token_counter.count_line, self._metrics_worker,
+                                               self.update_symbol_counter)
+        self._main_metrics = DocumentMetrics(self.view.ui.plainTextEdit_main.document(),
+                                             self.token_counter.count_line, self._metrics_worker,
+                                             self.update_symbol_counter)
+        self.section_model = SectionListModel(self.merge_session, self._request_section_metrics, self.view)
+        self.view.section_viewer.setModel(self.section_model)
+        self._reset_session(self._main_length())
 
         self.setup_connections()
+        self.set_tokenizer(SettingsManager().load_tokenizer(), show_errors=False)
         self._apply_top_controls_visibility()
 
         self.update_symbol_counter()
@@ -34,6 +86,7 @@ class MainPresenter:
         ui.button_clear_main.clicked.connect(self.clear_main)
         ui.button_clear.clicked.connect(self.clear_all)
         ui.button_pin.toggled.connect(self.toggle_always_on_top)
+        self.view.button_cancel.clicked.connect(self.cancel_processing)
 
         ui.button_copy.clicked.connect(self.copy_to_clipboard)
         ui.button_save.clicked.connect(self.save_to_txt)
@@ -45,9 +98,28 @@ class MainPresenter:
         ui.action_relative.triggered.connect(self.select_relative)
         ui.action_about.triggered.connect(self.show_about)
         ui.action_edit_ignored.triggered.connect(self.edit_ignored_folders)
+        self.view.action_tree_limits.triggered.connect(self.edit_tree_limits)
+        self.view.action_clear_index.triggered.connect(self.clear_project_indexes)
+        self.view.action_cache_size.triggered.connect(self.edit_content_cache_size)
+        self.view.action_cache_stats.triggered.connect(self.show_cache_stats)
+        self.view.action_processing_report.triggered.connect(self.show_processing_report)
+        self.view.action_tokenizer_heuristic.triggered.connect(lambda: self.set_tokenizer(HEURISTIC_TOKENIZER))
+        self.view.action_tokenizer_bpe.triggered.connect(self.select_bpe_tokenizer)
+        self.view.action_section_viewer.triggered.connect(self.toggle_section_viewer)
+        self.view.action_spill_threshold.triggered.connect(self.edit_spill_threshold)
+        self.view.button_page_prev.clicked.connect(lambda: self._show_spill_page(self._spill_page - 1))
+        self.view.button_page_next.clicked.connect(lambda: self._show_spill_page(self._spill_page + 1))
+        self.section_model.dataChanged.connect(self.update_symbol_counter)
+
+        for action in (ui.action_markdown, ui.action_xml, ui.action_filename_only, ui.action_fullpath,
+                       ui.action_relative, ui.action_add_language, ui.action_show_ignored,
+                       self.view.action_use_gitignore):
+            action.triggered.connect(self.schedule_rerender)
+        ui.lineEdit_project_root.editingFinished.connect(self.schedule_rerender)
 
         ui.textEdit_prompt.textChanged.connect(self.update_symbol_counter)
         ui.plainTextEdit_main.textChanged.connect(self.update_symbol_counter)
+        ui.plainTextEdit_main.document().contentsChange.connect(self._on_main_contents_change)
 
     def _apply_top_controls_visibility(self):
         ui = self.view.ui
@@ -95,86 +167,514 @@ class MainPresenter:
         self.view.overlay.show_temporary_message("Prompt cleared", duration=200)
 
     def clear_main(self):
+        if self._refuse_while_exporting():
+            return
         ui = self.view.ui
+        self._stop_spill()
         ui.plainTextEdit_main.clear()
+        self._reset_session()
         self.update_symbol_counter()
         self.view.overlay.show_temporary_message("Merge cleared", duration=200)
 
     def clear_all(self):
+        if self._refuse_while_exporting():
+            return
         ui = self.view.ui
         ui.textEdit_prompt.clear()
+        self._stop_spill()
         ui.plainTextEdit_main.clear()
+        self._reset_session()
         # ui.lineEdit_project_root.clear()
         self.update_symbol_counter()
         self.view.overlay.show_temporary_message("All cleared", duration=200)
 
     def copy_to_clipboard(self):
-        full_text = self.get_full_text()
-        QApplication.clipboard().setText(full_text)
+        parts, _ = self._output_parts()
+        QApplication.clipboard().setMimeData(LazyTextMimeData(parts))
         self.view.overlay.show_temporary_message("Copied to clipboard", duration=500)
 
     def save_to_txt(self):
-        full_text = self.get_full_text()
+        if self.is_processing() or self._refuse_while_exporting():
+            return
         path, _ = QFileDialog.getSaveFileName(self.view, "Save File", filter="Text Files (*.txt)")
-        if path:
-            try:
-                with open(path, 'w', encoding='utf-8') as f:
-                    f.write(full_text)
-                self.view.overlay.show_temporary_message("File saved successfully", duration=500)
-            except Exception as e:
-                QMessageBox.critical(self.view, "Error", f"Error saving file: {str(e)}")
+        if not path:
+            return
+        parts, total = self._output_parts()
+        worker = ExportWorker(path, parts, total)
+        thread = QThread(self.view)
+        worker.moveToThread(thread)
+
+        thread.started.connect(worker.run)
+        worker.progress.connect(self._on_export_progress)
+        worker.finished.connect(self._on_export_finished)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+
+        self._export_thread = thread
+        self._export_worker = worker
+        self.view.set_processing_state(True)
+        self.view.set_progress(0, total // 1024, "Saving...")
+        thread.start()
+
+    def _on_export_progress(self, done, total, path):
+        self.view.set_progress(done, total, f"Saving {os.path.basename(path)}")
+
+    def _on_export_finished(self, cancelled, error):
+        self._export_thread = None
+        self._export_worker = None
+        self.view.set_processing_state(False)
+        if error:
+            QMessageBox.critical(self.view, "Error", error)
+        elif cancelled:
+            self.view.overlay.show_temporary_message("Saving cancelled", duration=500)
+        else:
+            self.view.overlay.show_temporary_message("File saved successfully", duration=500)
+        QTimer.singleShot(0, self._open_pending_paths)
+
+    def _refuse_while_exporting(self):
+        if self._export_thread is None:
+            return False
+        self.view.overlay.show_temporary_message("Still saving the previous export", duration=800)
+        return True
 
     def get_full_text(self) -> str:
+        return "".join(iter_text_parts(self._output_parts()[0]))
+
+    def _output_parts(self):
         ui = self.view.ui
-        parts = []
-        if ui.checkBox_prompt.isChecked():
-            parts.append(ui.textEdit_prompt.toPlainText())
-        parts.append(ui.plainTextEdit_main.toPlainText())
-        return "\n\n".join([p for p in parts if p])
+        prompt = ui.textEdit_prompt.toPlainText() if ui.checkBox_prompt.isChecked() else ""
+        if self._spill is not None:
+            main, total = [self._spill], len(self._spill)
+        elif self.view.section_viewer_visible() or self._session_in_sync():
+            session = self.merge_session
+            main = [self._main_text(0, session.prefix_length)] if session.prefix_length else []
+            main += [section if not section.edited or self.view.section_viewer_visible() else self._span_text(index)
+                     for index, section in enumerate(session.sections)]
+            total = session.end()
+        else:
+            text = ui.plainTextEdit_main.toPlainText()
+            main, total = [text] if text else [], len(text)
+        parts = [prompt] if prompt else []
+        if prompt and total:
+            parts.append("\n\n")
+        return parts + main, total + len(prompt)
 
     def update_symbol_counter(self):
         self._metrics_timer.start()
 
     def _recompute_metrics(self):
-        ui = self.view.ui
-        prompt_enabled = ui.checkBox_prompt.isChecked()
-        text1 = ui.textEdit_prompt.toPlainText() if prompt_enabled else ""
-        text2 = ui.plainTextEdit_main.toPlainText()
+        prompt_enabled = self.view.ui.checkBox_prompt.isChecked()
+        if self._spill is not None:
+            totals = self._spill_totals
+        elif self.view.section_viewer_visible():
+            totals = self.section_model.totals()
+        else:
+            totals = self._main_metrics.totals()
+        if prompt_enabled:
+            totals = tuple(a + b for a, b in zip(totals, self._prompt_metrics.totals()))
+        self.view.set_status_metrics(*totals)
+
+    def is_processing(self) -> bool:
+        return self._drop_thread is not None
+
+    def open_paths(self, paths):
+        self.view.bring_to_front()
+        if not paths:
+            return
+        if self.is_processing() or self._export_thread is not None:
+            self._pending_paths.extend(paths)
+            return
+        self.handle_dropped_items(paths)
+
+    def _open_pending_paths(self):
+        if self._pending_paths and not self.is_processing() and self._export_thread is None:
+            paths, self._pending_paths = self._pending_paths, []
+            self.handle_dropped_items(paths)
 
-        chars_ws = len(text1) + len(text2)
+    def handle_dropped_items(self, paths):
+        if self.is_processing():
+            self.view.overlay.show_temporary_message("Still processing previous drop", duration=800)
+            return
+        if self._refuse_while_exporting():
+            return
 
-        def no_ws_len(s: str) -> int:
-            return len(s) - (s.count(" ") + s.count("\t") + s.count("\n") + s.count("\r"))
-        chars_no_ws = no_ws_len(text1) + no_ws_len(text2)
+        editor = self.view.ui.plainTextEdit_main
+        append_mode = self.view.ui.action_append.isChecked()
+        if not append_mode:
+            self._stop_spill()
+            editor.clear()
+            self._reset_session()
+        elif self._spill is None and not self._session_in_sync():
+            self._reset_session(self._main_length())
+        if self._spill is not None:
+            self._drop_needs_separator = append_mode and len(self._spill) > 0
+        elif self.view.section_viewer_visible():
+            self._drop_needs_separator = append_mode and len(self.merge_session) > 0
+        else:
+            self._drop_needs_separator = append_mode and not editor.document().isEmpty()
+
+        self.report.clear()
+        if self._report_dialog is not None:
+            self._report_dialog.refresh()
+        worker = DropWorker(paths, self.get_current_settings(), self.processor.ignore_engine)
+        thread = QThread(self.view)
+        worker.moveToThread(thread)
+
+        thread.started.connect(worker.run)
+        worker.progress.connect(self._on_drop_progress)
+        worker.batch_ready.connect(self._on_drop_batch)
+        worker.issue.connect(self.report.add)
+        worker.finished.connect(self._on_drop_finished)
+        worker.finished.connect(thread.quit)
+        thread.finished.connect(worker.deleteLater)
+        thread.finished.connect(thread.deleteLater)
+
+        self._drop_thread = thread
+        self._drop_worker = worker
+        self.view.set_processing_state(True)
+        self.view.overlay.show_overlay("Processing...")
+        thread.start()
+
+    def cancel_processing(self):
+        if self._export_worker is not None:
+            self._export_worker.cancel()
+            self.view.button_cancel.setEnabled(False)
+        if self._drop_worker is not None:
+            self._drop_worker.cancel()
+            self.view.button_cancel.setEnabled(False)
+            self.view.overlay.show_overlay("Cancelling...")
+
+    def shutdown(self):
+        if self._drop_worker is not None:
+            self._drop_worker.cancel()
+        if self._drop_thread is not None:
+            self._drop_thread.quit()
+            self._drop_thread.wait()
+        if self._export_worker is not None:
+            self._export_worker.cancel()
+        if self._export_thread is not None:
+            self._export_thread.quit()
+            self._export_thread.wait()
+        if self.view.section_viewer_visible():
+            self._leave_section_viewer()
+        elif self._spill is not None:
+            self._replace_main_range(0, self._main_length(), "")
+        self._metrics_timer.stop()
+        self._metrics_worker.shutdown()
+        self._stop_spill()
+
+    def _on_drop_progress(self, done, total, path):
+        message = f"Processing {done}/{total}" if total > 0 else f"Processing {done}"
+        if path:
+            message += f": {os.path.basename(os.path.normpath(path))}"
+        self.view.set_progress(done, total, message)
+        self.view.overlay.set_message(message.split(":")[0] + "...")
+
+    def _on_drop_batch(self, sections):
+        if self._drop_needs_separator:
+            sections[0].set_separator("\n")
+            self._drop_needs_separator = False
+        if self._spill is None and self._should_spill(sum(section.length for section in sections)):
+            self._start_spill()
+        if self._spill is not None:
+            self._append_to_spill("".join(section.text for section in sections))
+            return
+        self.section_model.append_sections(sections)
+        if self.view.section_viewer_visible():
+            self.update_symbol_counter()
+        else:
+            self._append_to_main("".join(section.text for section in sections))
+
+    def _append_to_main(self, text):
+        end = self._main_length()
+        self._replace_main_range(end, end, text)
+
+    def _replace_main_range(self, start, end, text):
+        editor = self.view.ui.plainTextEdit_main
+        cursor = QTextCursor(editor.document())
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        was_blocked = editor.blockSignals(True)
+        self._session_edit = True
+        try:
+            cursor.beginEditBlock()
+            cursor.insertText(text)
+            cursor.endEditBlock()
+        finally:
+            self._session_edit = False
+            editor.blockSignals(was_blocked)
+        self.update_symbol_counter()
 
-        words = sum(1 for _ in self._word_re.finditer(text1)) + \
-                sum(1 for _ in self._word_re.finditer(text2))
+    def _main_text(self, start, end):
+        cursor = QTextCursor(self.view.ui.plainTextEdit_main.document())
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.KeepAnchor)
+        return cursor.selectedText().replace("\u2029", "\n")
+
+    def _main_length(self):
+        return self.view.ui.plainTextEdit_main.document().characterCount() - 1
+
+    def _on_main_contents_change(self, position, chars_removed, chars_added):
+        if not self._session_edit:
+            self.merge_session.apply_external_edit(position, chars_removed, chars_added)
+
+    def _session_in_sync(self):
+        if self.view.section_viewer_visible():
+            return True
+        return self.merge_session.synced and self.merge_session.end() == self._main_length()
+
+    def _reset_session(self, prefix_length=0):
+        self.merge_session.reset(prefix_length)
+        self.section_model.sections_changed()
+
+    def _span_text(self, index):
+        section = self.merge_session.sections[index]
+        if section.edited and not self.view.section_viewer_visible():
+            return self._main_text(*self.merge_session.span(index))
+        return section.text
+
+    def _sections_changed(self, start, end, text):
+        self.section_model.sections_changed()
+        if self.view.section_viewer_visible():
+            self.update_symbol_counter()
+        else:
+            self._replace_main_range(start, end, text)
+
+    def _request_section_metrics(self, section, callback):
+        self._metrics_worker.request(
+            ("section", section.id), lambda: (section.id, section.text, None),
+            lambda section_id, metrics: callback(section_id, metrics.totals()), separator="\n"
+        )
+
+    def toggle_section_viewer(self, enabled):
+        if enabled == self.view.section_viewer_visible():
+            return
+        if self.is_processing() or self._export_thread is not None or not self._session_in_sync():
+            self.view.action_section_viewer.setChecked(not enabled)
+            self.view.overlay.show_temporary_message("Finish processing or clear the merge first", duration=800)
+            return
+        session = self.merge_session
+        if enabled:
+            position = session.prefix_length
+            adopted = set()
+            for section in session.sections:
+                end = position + section.length
+                if section.edited:
+                    section.adopt_text(self._main_text(position, end))
+                    adopted.add(section.id)
+                position = end
+            if session.prefix_length:
+                text_section = MergeSection("", 'text', "", "", source='editor')
+                text_section.adopt_text(self._main_text(0, session.prefix_length))
+                session.sections.insert(0, text_section)
+                session.prefix_length = 0
+            self._session_edit = True
+            try:
+                self.view.ui.plainTextEdit_main.clear()
+            finally:
+                self._session_edit = False
+            self.section_model.sections_changed(adopted)
+            self.view.show_section_viewer(True)
+        else:
+            self._leave_section_viewer()
+        self.update_symbol_counter()
 
-        def line_count(s: str) -> int:
-            return s.count("\n") + (1 if s else 0)
-        lines = line_count(text1) + line_count(text2)
+    def _leave_section_viewer(self):
+        self.view.show_section_viewer(False)
+        self._replace_main_range(0, self._main_length(),
+                                 "".join(section.text for section in self.merge_session.sections))
 
-        self.view.set_status_metrics(words, chars_no_ws, chars_ws, lines)
+    def schedule_rerender(self):
+        self._rerender_timer.start()
 
-    def handle_dropped_items(self, paths):
-        append_mode = self.view.ui.action_append.isChecked()
-        new_text = ""
-        for path in paths:
-            if os.path.isdir(path) or os.path.isfile(path):
-                processed = self.processor.process_file(path, self.get_current_settings())
-                if processed is None:
-                    QMessageBox.warning(self.view, "Warning",
-                        f"File or folder '{path}' is binary or could not be processed.")
-                else:
-                    new_text += processed + "\n"
-        if not append_mode:
-            self.view.ui.plainTextEdit_main.setPlainText(new_text)
+    def rerender_sections(self):
+        if self.is_processing() or not self.merge_session.sections or not self._session_in_sync():
+            return
+        settings = self.get_current_settings()
+        session = self.merge_session
+        start = position = session.prefix_length
+        parts = []
+        changed = False
+        for index, section in enumerate(session.sections):
+            end = position + section.length
+            if section.edited or section.kind == 'text':
+                parts.append(self._span_text(index))
+            else:
+                rendered = self.processor.rerender_section(section, settings)
+                if rendered.block != section.block:
+                    session.replace(index, rendered)
+                    changed = True
+                parts.append(session.sections[index].text)
+            position = end
+        if changed:
+            self._sections_changed(start, position, "".join(parts))
+
+    def populate_section_menu(self, menu, position):
+        if self.is_processing() or not self._session_in_sync():
+            return
+        index = self.merge_session.index_at(position)
+        if index is not None:
+            self._add_section_actions(menu, index)
+
+    def populate_section_menu_for_row(self, menu, row):
+        if not self.is_processing() and row < len(self.merge_session):
+            self._add_section_actions(menu, row)
+
+    def _add_section_actions(self, menu, index):
+        section = self.merge_session.sections[index]
+        name = os.path.basename(os.path.normpath(section.path)) if section.path else "text"
+        menu.addSeparator()
+        menu.addAction("Copy Section", lambda: QApplication.clipboard().setText(
+            self._span_text(self.merge_session.index_of(section.id))))
+        menu.addAction(f"Remove Section '{name}'", lambda: self.remove_section(section.id))
+        move_up = menu.addAction("Move Section Up", lambda: self.move_section(section.id, -1))
+        move_up.setEnabled(index > 0)
+        move_down = menu.addAction("Move Section Down", lambda: self.move_section(section.id, 1))
+        move_down.setEnabled(index < len(self.merge_session) - 1)
+        refresh = menu.addAction("Refresh Section from Disk", lambda: self.refresh_section(section.id))
+        refresh.setEnabled(section.source == 'filesystem')
+
+    def remove_section(self, section_id):
+        if not self._session_in_sync():
+            return
+        index = self.merge_session.index_of(section_id)
+        start, end = self.merge_session.span(index)
+        self.merge_session.remove(index)
+        self._sections_changed(start, end, "")
+
+    def move_section(self, section_id, offset):
+        if not self._session_in_sync():
+            return
+        index = self.merge_session.index_of(section_id)
+        other = index + offset
+        if other < 0 or other >= len(self.merge_session):
+            return
+        first, second = sorted((index, other))
+        start, middle = self.merge_session.span(first)
+        _, end = self.merge_session.span(second)
+        swapped = self._span_text(second) + self._span_text(first)
+        self.merge_session.move(index, other)
+        self._sections_changed(start, end, swapped)
+
+    def refresh_section(self, section_id):
+        if not self._session_in_sync():
+            return
+        index = self.merge_session.index_of(section_id)
+        old = self.merge_session.sections[index]
+        section = self.processor.process_section(old.path, self.get_current_settings()) \
+            if os.path.exists(old.path) else None
+        if section is None:
+            QMessageBox.warning(self.view, "Warning", f"'{old.path}' could not be refreshed.")
+            return
+        start, end = self.merge_session.span(index)
+        self.merge_session.replace(index, section)
+        self._sections_changed(start, end, section.text)
+
+    def _should_spill(self, extra_length):
+        if self.spill_threshold_mb <= 0 or self.view.section_viewer_visible():
+            return False
+        return self._main_length() + extra_length > self.spill_threshold_mb * 1024 * 1024
+
+    def _start_spill(self):
+        self._spill = SpillBuffer(self.spill_threshold_mb * 1024 * 1024)
+        self._spill_page = 0
+        self._spill_generation += 1
+        self._spill_totals = (0, 0, 0, 0, 0)
+        self._spill_tail = ""
+        self._spill_last_line = (0, 0, 0, 0)
+        self.view.set_spill_state(True)
+        self._append_to_spill(self.view.ui.plainTextEdit_main.toPlainText())
+        self._reset_session()
+        self.merge_session.synced = False
+
+    def _stop_spill(self):
+        if self._spill is None:
+            return
+        mime_data = QApplication.clipboard().mimeData()
+        if not isinstance(mime_data, LazyTextMimeData) or not mime_data.adopt(self._spill):
+            self._spill.close()
+        self._spill = None
+        self.view.set_spill_state(False)
+
+    def _append_to_spill(self, text):
+        if not text:
+            return
+        last_page = self._spill_page_count() - 1
+        self._spill.append(text)
+        generation = self._spill_generation
+        continued = self._spill_tail + text
+        self._spill_tail = continued[continued.rfind("\n") + 1:]
+        self._metrics_worker.request(("spill", generation, len(self._spill)), lambda: (generation, continued, None),
+                                     self._on_spill_metrics, separator="\n")
+        if self._spill_page == last_page:
+            self._show_spill_page(self._spill_page)
         else:
-            current_text = self.view.ui.plainTextEdit_main.toPlainText()
-            combined = current_text + "\n" + new_text if current_text else new_text
-            self.view.ui.plainTextEdit_main.setPlainText(combined)
+            self.view.set_spill_page(self._spill_page, self._spill_page_count())
+
+    def _on_spill_metrics(self, generation, metrics):
+        if self._spill is None or generation != self._spill_generation:
+            return
+        words, chars_no_ws, chars, lines, tokens = self._spill_totals
+        last_words, last_chars_no_ws, last_chars, last_tokens = self._spill_last_line
+        new_words, new_chars_no_ws, new_chars, _, new_tokens = metrics.totals()
+        self._spill_totals = (words - last_words + new_words, chars_no_ws - last_chars_no_ws + new_chars_no_ws,
+                              chars - last_chars + new_chars, max(lines - 1, 0) + metrics.block_count(),
+                              tokens - last_tokens + new_tokens)
+        self._spill_last_line = metrics.last_line()
         self.update_symbol_counter()
 
+    def _spill_page_count(self):
+        return max(1, -(-len(self._spill) // self.SPILL_PAGE_CHARS))
+
+    def _show_spill_page(self, page):
+        if self._spill is None:
+            return
+        pages = self._spill_page_count()
+        self._spill_page = min(max(page, 0), pages - 1)
+        text = self._spill.read(self._spill_page * self.SPILL_PAGE_CHARS, self.SPILL_PAGE_CHARS)
+        editor = self.view.ui.plainTextEdit_main
+        scroll = editor.verticalScrollBar().value() if page == self._spill_page else 0
+        self._session_edit = True
+        try:
+            editor.setPlainText(text)
+        finally:
+            self._session_edit = False
+        editor.verticalScrollBar().setValue(scroll)
+        self.view.set_spill_page(self._spill_page, pages)
+
+    def edit_spill_threshold(self):
+        size_mb, ok = QInputDialog.getInt(self.view, "Disk Spill",
+                                          "Move merged output to a temporary file above (MB, 0 disables):",
+                                          self.spill_threshold_mb, 0, 65536)
+        if ok:
+            self.spill_threshold_mb = size_mb
+            SettingsManager().save_spill_threshold_mb(size_mb)
+
+    def _show_processing_error(self, error):
+        QMessageBox.critical(self.view, error.title, str(error))
+
+    def _on_drop_finished(self, cancelled):
+        self._drop_thread = None
+        self._drop_worker = None
+        self.view.set_processing_state(False)
+        self.update_symbol_counter()
+        if cancelled:
+            self.view.overlay.show_temporary_message("Processing cancelled", duration=500)
+        elif self.report:
+            self.view.overlay.show_temporary_message(f"Done: {self.report.summary()}", duration=1500)
+            self.show_processing_report()
+        else:
+            self.view.overlay.hide_overlay()
+        QTimer.singleShot(0, self._open_pending_paths)
+
+    def show_processing_report(self):
+        if self._report_dialog is None:
+            self._report_dialog = ProcessingReportDialog(self.report, self.view)
+        self._report_dialog.refresh()
+        self._report_dialog.show()
+        self._report_dialog.raise_()
+
     def get_current_settings(self) -> dict:
         ui = self.view.ui
         settings = {'format': 'markdown' if ui.action_markdown.isChecked() else 'xml'}
@@ -190,6 +690,12 @@ class MainPresenter:
             settings['path_style'] = 'filename'
         settings['show_ignored'] = ui.action_show_ignored.isChecked() if hasattr(ui, 'action_show_ignored') else True
         settings['add_language'] = ui.action_add_language.isChecked() if hasattr(ui, 'action_add_language') else True
+        settings['use_gitignore'] = self.view.action_use_gitignore.isChecked()
+        settings['folder_source'] = self.view.folder_source()
+        settings['use_index'] = self.view.action_use_index.isChecked()
+        settings['folder_mode'] = 'tree_contents' if self.view.action_folder_contents.isChecked() else 'tree'
+        for key, value in self.tree_limits.items():
+            settings[key] = value if value > 0 else None
         return settings
 
     def select_markdown(self):
@@ -234,8 +740,76 @@ class MainPresenter:
         dialog = IgnoredFoldersDialog(current_ignored, self.view)
         if dialog.exec() == QDialog.Accepted:
             new_list = dialog.get_ignored_folders()
+            self.processor.ignored_dirs = new_list
             settings_manager.save_ignored_folders(new_list)
-            self.processor.ignored_dirs = set(new_list)
+            invalid = self.processor.ignore_engine.invalid_patterns
+            if invalid:
+                QMessageBox.warning(self.view, "Warning",
+                    "These ignore patterns are invalid and will be skipped:\n" + "\n".join(invalid))
+            self.schedule_rerender()
+
+    def edit_tree_limits(self):
+        dialog = TreeLimitsDialog(self.tree_limits, self.view)
+        if dialog.exec() == QDialog.Accepted:
+            self.tree_limits = dialog.get_tree_limits()
+            SettingsManager().save_tree_limits(self.tree_limits)
+            self.schedule_rerender()
+
+    def clear_project_indexes(self):
+        if self.is_processing():
+            self.view.overlay.show_temporary_message("Still processing previous drop", duration=800)
+            return
+        clear_indexes()
+        self.view.overlay.show_temporary_message("Project indexes cleared", duration=500)
+
+    def edit_content_cache_size(self):
+        current = CONTENT_CACHE.budget // (1024 * 1024)
+        size_mb, ok = QInputDialog.getInt(self.view, "Content Cache", "Memory budget for cached file contents (MB):",
+                                          current, 0, 65536)
+        if ok:
+            CONTENT_CACHE.set_budget(size_mb * 1024 * 1024)
+            SettingsManager().save_content_cache_mb(size_mb)
+
+    def show_cache_stats(self):
+        stats = CONTENT_CACHE.stats()
+        QMessageBox.information(
+            self.view, "Cache Statistics",
+            f"Hits: {stats['hits']}\n"
+            f"Misses: {stats['misses']}\n"
+            f"Hit rate: {stats['hit_rate']:.1%}\n"
+            f"Cached files: {stats['entries']}\n"
+            f"Memory used: {stats['size'] / (1024 * 1024):.1f} MB of {stats['budget'] / (1024 * 1024):.0f} MB"
+        )
+
+    def select_bpe_tokenizer(self):
+        path, _ = QFileDialog.getOpenFileName(self.view, "Select BPE Vocabulary",
+                                              filter="tiktoken BPE files (*.tiktoken);;All Files (*)")
+        if path:
+            self.set_tokenizer(path)
+        else:
+            self._sync_tokenizer_actions()
+
+    def set_tokenizer(self, spec, show_errors=True):
+        try:
+            tokenizer = load_tokenizer(spec)
+        except Exception as e:
+            if show_errors:
+                QMessageBox.critical(self.view, "Error", f"Error loading tokenizer {spec}: {e}")
+            spec, tokenizer = HEURISTIC_TOKENIZER, load_tokenizer(HEURISTIC_TOKENIZER)
+        self.tokenizer_spec = spec
+        self.token_counter.set_tokenizer(tokenizer)
+        self._prompt_metrics.invalidate()
+        self._main_metrics.invalidate()
+        self.section_model.invalidate_metrics()
+        SettingsManager().save_tokenizer(spec)
+        self._sync_tokenizer_actions()
+        self.update_symbol_counter()
+
+    def _sync_tokenizer_actions(self):
+        is_heuristic = self.tokenizer_spec == HEURISTIC_TOKENIZER
+        self.view.action_tokenizer_heuristic.setChecked(is_heuristic)
+        self.view.action_tokenizer_bpe.setChecked(not is_heuristic)
+        self.view.set_tokenizer_name(self.token_counter.tokenizer.name)
 
     def toggle_always_on_top(self, checked: bool):
         self.view.set_always_on_top(checked)
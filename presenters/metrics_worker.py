@@ -0,0 +1,49 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtCore import QObject, Signal
+
+from core.text_metrics import TextMetrics
+
+PARAGRAPH_SEPARATOR = "\u2029"
+
+
+class MetricsWorker(QObject):
+    _done = Signal(object, int, object)
+
+    def __init__(self, count_tokens=None, parent=None):
+        super().__init__(parent)
+        self.count_tokens = count_tokens
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pix-metrics")
+        self._running = {}
+        self._pending = {}
+        self._done.connect(self._on_done)
+
+    def request(self, key, snapshot, callback, separator=PARAGRAPH_SEPARATOR):
+        if key in self._running:
+            self._pending[key] = (snapshot, callback, separator)
+            return
+        self._start(key, snapshot, callback, separator)
+
+    def _start(self, key, snapshot, callback, separator=PARAGRAPH_SEPARATOR):
+        revision, text, block_count = snapshot()
+        self._running[key] = callback
+        future = self._executor.submit(self._compute, text, block_count, separator)
+        future.add_done_callback(lambda f: self._done.emit(
+            key, revision, f.result() if not f.cancelled() and f.exception() is None else None))
+
+    def _compute(self, raw_text, block_count, separator=PARAGRAPH_SEPARATOR):
+        metrics = TextMetrics(self.count_tokens)
+        metrics.reset(raw_text.split(separator)[:block_count])
+        return metrics
+
+    def _on_done(self, key, revision, metrics):
+        callback = self._running.pop(key, None)
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            self._start(key, *pending)
+        elif callback is not None and metrics is not None:
+            callback(revision, metrics)
+
+    def shutdown(self):
+        self._pending.clear()
+        self._executor.shutdown(wait=True, cancel_futures=True)
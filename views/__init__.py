@@ -1,3 +1,4 @@
-from views.custom import AboutWindow, IgnoredFoldersDialog
+from views.custom import AboutWindow, IgnoredFoldersDialog, ProcessingReportDialog, SectionViewer, \
+    TreeLimitsDialog
 from views.generated import Ui_MainWindow
 from views.main_window_view import MainWindow
\ No newline at end of file
@@ -1,2 +1,5 @@
 from views.custom.about_window import AboutWindow
-from views.custom.ignored_folders_dialog import IgnoredFoldersDialog
\ No newline at end of file
+from views.custom.ignored_folders_dialog import IgnoredFoldersDialog
+from views.custom.processing_report_dialog import ProcessingReportDialog
+from views.custom.section_viewer import SectionViewer
+from views.custom.tree_limits_dialog import TreeLimitsDialog
\ No newline at end of file
@@ -14,11 +14,11 @@ class IgnoredFoldersDialog(QDialog):
         self.resize(400, 300)
         self.ignored_folders = ignored_folders if ignored_folders else DEFAULT_IGNORED_FOLDERS.copy()
 
-        self.label = QLabel("Ignored Folders:", self)
+        self.label = QLabel("Ignored folders (plain names) or .gitignore-style patterns:", self)
         self.list_widget = QListWidget(self)
         self.list_widget.addItems(self.ignored_folders)
         self.input_line = QLineEdit(self)
-        self.input_line.setPlaceholderText("Enter folder name...")
+        self.input_line.setPlaceholderText("Enter folder name or pattern, e.g. *.log or !keep/")
         self.add_button = QPushButton("Add", self)
         self.remove_button = QPushButton("Remove Selected", self)
         self.reset_button = QPushButton("Reset", self)
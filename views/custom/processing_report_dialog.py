@@ -0,0 +1,84 @@
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QLabel, QComboBox, \
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView, QFileDialog, QMessageBox
+
+from core.report import SKIPPED, FAILED
+
+
+class ProcessingReportDialog(QDialog):
+    def __init__(self, report, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Processing Report")
+        self.resize(720, 420)
+        self.report = report
+
+        self.label = QLabel(self)
+        self.filter_line = QLineEdit(self)
+        self.filter_line.setPlaceholderText("Filter by path or reason")
+        self.kind_combo = QComboBox(self)
+        self.kind_combo.addItem("All", None)
+        self.kind_combo.addItem("Skipped", SKIPPED)
+        self.kind_combo.addItem("Errors", FAILED)
+
+        self.table = QTableWidget(0, 4, self)
+        self.table.setHorizontalHeaderLabels(["Type", "Path", "Reason", "Size"])
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(1, QHeaderView.Stretch)
+        header.setSectionResizeMode(2, QHeaderView.Interactive)
+        header.setSectionResizeMode(3, QHeaderView.ResizeToContents)
+
+        self.export_button = QPushButton("Export...", self)
+        self.close_button = QPushButton("Close", self)
+
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(self.filter_line)
+        filter_layout.addWidget(self.kind_combo)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.export_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.close_button)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.addWidget(self.label)
+        main_layout.addLayout(filter_layout)
+        main_layout.addWidget(self.table)
+        main_layout.addLayout(button_layout)
+        self.setLayout(main_layout)
+
+        self.filter_line.textChanged.connect(self.refresh)
+        self.kind_combo.currentIndexChanged.connect(self.refresh)
+        self.export_button.clicked.connect(self.export_report)
+        self.close_button.clicked.connect(self.close)
+        self.refresh()
+
+    def visible_entries(self):
+        return self.report.filtered(self.filter_line.text().strip(), self.kind_combo.currentData())
+
+    def refresh(self):
+        entries = self.visible_entries()
+        self.label.setText(f"{self.report.summary() or 'No problems'} ({len(entries)} shown)")
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(entries))
+        for row, entry in enumerate(entries):
+            size_item = QTableWidgetItem()
+            if entry.size is not None:
+                size_item.setData(Qt.DisplayRole, entry.size)
+            for column, item in enumerate((QTableWidgetItem("Skipped" if entry.kind == SKIPPED else "Error"),
+                                           QTableWidgetItem(entry.path), QTableWidgetItem(entry.reason),
+                                           size_item)):
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+
+    def export_report(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Report", "report.csv", filter="CSV Files (*.csv)")
+        if not path:
+            return
+        try:
+            self.report.write_csv(path, self.visible_entries())
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"Error exporting report: {e}")
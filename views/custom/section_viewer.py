@@ -0,0 +1,104 @@
+from array import array
+
+from PySide6.QtCore import Qt, QRect, QSize
+from PySide6.QtGui import QFontDatabase, QFontMetrics
+from PySide6.QtWidgets import QAbstractItemView, QListView, QStyle, QStyledItemDelegate
+
+from models.section_list_model import SectionListModel
+
+
+class SectionDelegate(QStyledItemDelegate):
+    PADDING = 4
+    LINE_CACHE_SIZE = 64
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font = QFontDatabase.systemFont(QFontDatabase.FixedFont)
+        self.metrics = QFontMetrics(self.font)
+        self._line_starts = {}
+
+    def header_height(self):
+        return self.metrics.height() + self.PADDING * 2
+
+    def sizeHint(self, option, index):
+        section = index.data(SectionListModel.SectionRole)
+        height = self.header_height()
+        if section is not None and not index.data(SectionListModel.CollapsedRole):
+            height += section.line_count * self.metrics.lineSpacing() + self.PADDING
+        return QSize(self.parent().viewport().width(), height)
+
+    def _starts(self, section):
+        starts = self._line_starts.get(section.id)
+        if starts is None:
+            if len(self._line_starts) >= self.LINE_CACHE_SIZE:
+                self._line_starts.clear()
+            block = section.block
+            starts = array('q', [0])
+            position = block.find("\n")
+            while position != -1:
+                starts.append(position + 1)
+                position = block.find("\n", position + 1)
+            self._line_starts[section.id] = starts
+        return starts
+
+    def paint(self, painter, option, index):
+        section = index.data(SectionListModel.SectionRole)
+        if section is None:
+            return
+        painter.save()
+        rect = option.rect
+        header = QRect(rect.left(), rect.top(), rect.width(), self.header_height())
+        palette = option.palette
+        if option.state & QStyle.State_Selected:
+            painter.fillRect(header, palette.highlight())
+            painter.setPen(palette.highlightedText().color())
+        else:
+            painter.fillRect(header, palette.alternateBase())
+            painter.setPen(palette.text().color())
+
+        collapsed = index.data(SectionListModel.CollapsedRole)
+        arrow = "▸ " if collapsed else "▾ "
+        painter.drawText(header.adjusted(self.PADDING, 0, -self.PADDING, 0), Qt.AlignVCenter | Qt.AlignLeft,
+                         arrow + index.data(Qt.DisplayRole))
+
+        if not collapsed:
+            painter.setFont(self.font)
+            painter.setPen(palette.text().color())
+            line_height = self.metrics.lineSpacing()
+            body_top = header.bottom() + 1
+            visible = rect.intersected(option.widget.viewport().rect()) if option.widget else rect
+            first = max(0, (visible.top() - body_top) // line_height)
+            last = min(section.line_count, (visible.bottom() - body_top) // line_height + 1)
+            starts = self._starts(section)
+            block = section.block
+            for line in range(first, last):
+                start = starts[line]
+                end = starts[line + 1] - 1 if line + 1 < len(starts) else len(block)
+                text = block[start:min(end, start + 1000)].expandtabs(4)
+                painter.drawText(rect.left() + self.PADDING, body_top + line * line_height + self.metrics.ascent(),
+                                 text)
+        painter.restore()
+
+
+class SectionViewer(QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.section_delegate = SectionDelegate(self)
+        self.setItemDelegate(self.section_delegate)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.setLayoutMode(QListView.Batched)
+        self.setUniformItemSizes(False)
+        self.setResizeMode(QListView.Adjust)
+        self.setContextMenuPolicy(Qt.CustomContextMenu)
+
+    def mousePressEvent(self, event):
+        index = self.indexAt(event.position().toPoint())
+        if index.isValid() and event.button() == Qt.LeftButton:
+            offset = event.position().toPoint().y() - self.visualRect(index).top()
+            if offset < self.section_delegate.header_height():
+                self.model().toggle_collapsed(index.row())
+                self.section_delegate.sizeHintChanged.emit(index)
+        super().mousePressEvent(event)
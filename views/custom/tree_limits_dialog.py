@@ -0,0 +1,62 @@
+from PySide6.QtWidgets import QDialog, QFormLayout, QHBoxLayout, QVBoxLayout, QPushButton, QSpinBox, QLabel
+
+from core.file_processor import DEFAULT_TREE_LIMITS
+
+
+class TreeLimitsDialog(QDialog):
+    def __init__(self, limits, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("ASCII Tree Limits")
+        self.resize(320, 180)
+
+        self.label = QLabel("Set a limit to 0 to disable it.", self)
+        self.spin_depth = self._make_spin_box(100)
+        self.spin_entries = self._make_spin_box(1000000)
+        self.spin_lines = self._make_spin_box(10000000)
+        self._set_values(limits)
+
+        form_layout = QFormLayout()
+        form_layout.addRow("Maximum depth:", self.spin_depth)
+        form_layout.addRow("Entries per folder:", self.spin_entries)
+        form_layout.addRow("Total lines:", self.spin_lines)
+
+        self.reset_button = QPushButton("Reset", self)
+        self.ok_button = QPushButton("OK", self)
+        self.cancel_button = QPushButton("Cancel", self)
+
+        button_layout = QHBoxLayout()
+        button_layout.addWidget(self.reset_button)
+        button_layout.addStretch()
+        button_layout.addWidget(self.ok_button)
+        button_layout.addWidget(self.cancel_button)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.addWidget(self.label)
+        main_layout.addLayout(form_layout)
+        main_layout.addLayout(button_layout)
+        self.setLayout(main_layout)
+
+        self.reset_button.clicked.connect(self.reset_to_default)
+        self.ok_button.clicked.connect(self.accept)
+        self.cancel_button.clicked.connect(self.reject)
+
+    def _make_spin_box(self, maximum):
+        spin = QSpinBox(self)
+        spin.setRange(0, maximum)
+        spin.setSpecialValueText("Unlimited")
+        return spin
+
+    def _set_values(self, limits):
+        self.spin_depth.setValue(limits.get("tree_max_depth", 0))
+        self.spin_entries.setValue(limits.get("tree_max_entries", 0))
+        self.spin_lines.setValue(limits.get("tree_max_lines", 0))
+
+    def reset_to_default(self):
+        self._set_values(DEFAULT_TREE_LIMITS)
+
+    def get_tree_limits(self):
+        return {
+            "tree_max_depth": self.spin_depth.value(),
+            "tree_max_entries": self.spin_entries.value(),
+            "tree_max_lines": self.spin_lines.value()
+        }
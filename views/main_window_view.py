@@ -1,8 +1,9 @@
-from PySide6.QtWidgets import QMainWindow, QWidget, QLabel, QGraphicsOpacityEffect, QSizePolicy, QHBoxLayout
+from PySide6.QtWidgets import QMainWindow, QWidget, QLabel, QGraphicsOpacityEffect, QSizePolicy, QHBoxLayout, \
+    QProgressBar, QPushButton, QStackedWidget, QMenu
 from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer
-from PySide6.QtGui import QGuiApplication, QFontMetrics
+from PySide6.QtGui import QGuiApplication, QFontMetrics, QAction, QActionGroup
 
-from views import Ui_MainWindow
+from views import Ui_MainWindow, SectionViewer
 from models import MarkdownHighlighter, SettingsManager
 
 
@@ -60,10 +61,65 @@ class MainWindow(QMainWindow):
 
         self.splitter = self.ui.splitter
 
+        self.action_folder_contents = QAction("Merge folder contents with ASCII tree", self)
+        self.action_folder_contents.setCheckable(True)
+        self.action_use_gitignore = QAction("Respect .gitignore files", self)
+        self.action_use_gitignore.setCheckable(True)
+        self.action_use_gitignore.setChecked(True)
+        self.action_tree_limits = QAction("Edit ASCII tree limits", self)
+        self.ui.menuAppend.insertAction(self.ui.action_show_ignored, self.action_folder_contents)
+        self.ui.menuAppend.insertAction(self.ui.action_edit_ignored, self.action_use_gitignore)
+        self.ui.menuAppend.addAction(self.action_tree_limits)
+
+        self.menu_folder_source = self.ui.menuAppend.addMenu("Folder source")
+        self.folder_source_group = QActionGroup(self)
+        self.folder_source_actions = {}
+        for source, title in [
+            ("filesystem", "File system"),
+            ("git", "Git tracked files (working tree)"),
+            ("git_index", "Git tracked files (index)"),
+            ("git_head", "Git tracked files (HEAD)"),
+        ]:
+            action = QAction(title, self)
+            action.setCheckable(True)
+            self.folder_source_group.addAction(action)
+            self.menu_folder_source.addAction(action)
+            self.folder_source_actions[source] = action
+        self.folder_source_actions["filesystem"].setChecked(True)
+
+        self.action_use_index = QAction("Keep a project index for faster repeat drops", self)
+        self.action_use_index.setCheckable(True)
+        self.action_clear_index = QAction("Clear project indexes", self)
+        self.ui.menuAppend.addSeparator()
+        self.ui.menuAppend.addAction(self.action_use_index)
+        self.ui.menuAppend.addAction(self.action_clear_index)
+        self.action_cache_size = QAction("Set content cache size", self)
+        self.ui.menuAppend.addAction(self.action_cache_size)
+        self.action_spill_threshold = QAction("Set disk spill threshold", self)
+        self.ui.menuAppend.addAction(self.action_spill_threshold)
+        self.action_cache_stats = QAction("Cache statistics", self)
+        self.action_processing_report = QAction("Processing report", self)
+        self.action_section_viewer = QAction("Section viewer for large merges (read-only)", self)
+        self.action_section_viewer.setCheckable(True)
+        self.ui.menuAppend.addAction(self.action_section_viewer)
+
+        self.menu_tokenizer = self.ui.menuAppend.addMenu("Token counter")
+        self.tokenizer_group = QActionGroup(self)
+        self.action_tokenizer_heuristic = QAction("Heuristic estimate (fast)", self)
+        self.action_tokenizer_bpe = QAction("BPE vocabulary from file...", self)
+        for action in (self.action_tokenizer_heuristic, self.action_tokenizer_bpe):
+            action.setCheckable(True)
+            self.tokenizer_group.addAction(action)
+            self.menu_tokenizer.addAction(action)
+        self.action_tokenizer_heuristic.setChecked(True)
+        self.ui.menuHelp.insertAction(self.ui.action_about, self.action_cache_stats)
+        self.ui.menuHelp.insertAction(self.ui.action_about, self.action_processing_report)
+
         self._stat_words = QLabel("Words: 0")
         self._stat_chars_no_ws = QLabel("Characters (no spaces): 0")
         self._stat_chars_ws = QLabel("Characters: 0")
         self._stat_lines = QLabel("Lines: 0")
+        self._stat_tokens = QLabel("Tokens: 0")
 
         fm = QFontMetrics(self.font())
         for lab, sample in [
@@ -71,6 +127,7 @@ class MainWindow(QMainWindow):
             (self._stat_chars_no_ws, "Characters (no spaces): 0000000"),
             (self._stat_chars_ws, "Characters: 0000000"),
             (self._stat_lines, "Lines: 0000000"),
+            (self._stat_tokens, "Tokens: 0000000"),
         ]:
             lab.setMinimumWidth(fm.horizontalAdvance(sample))
             lab.setSizePolicy(QSizePolicy.Fixed, QSizePolicy.Preferred)
@@ -93,7 +150,8 @@ class MainWindow(QMainWindow):
             self._stat_words,
             self._stat_chars_no_ws,
             self._stat_chars_ws,
-            self._stat_lines
+            self._stat_lines,
+            self._stat_tokens
         ]
         for i, w in enumerate(items):
             hl.addWidget(w)
@@ -103,6 +161,22 @@ class MainWindow(QMainWindow):
         self.statusBar().addWidget(self._stat_container, 0)
         self.statusBar().setStyleSheet("QStatusBar::item { border: none; }")
 
+        self._progress_label = QLabel(self)
+        self._progress_bar = QProgressBar(self)
+        self._progress_bar.setMaximumWidth(fm.horizontalAdvance("0" * 24))
+        self._progress_bar.setTextVisible(False)
+        self.button_cancel = QPushButton("Cancel", self)
+        for w in (self._progress_label, self._progress_bar, self.button_cancel):
+            w.setVisible(False)
+            self.statusBar().addPermanentWidget(w)
+
+        self._page_label = QLabel(self)
+        self.button_page_prev = QPushButton("◀", self)
+        self.button_page_next = QPushButton("▶", self)
+        for w in (self.button_page_prev, self._page_label, self.button_page_next):
+            w.setVisible(False)
+            self.statusBar().addPermanentWidget(w)
+
         self.setAcceptDrops(True)
 
         settings_manager = SettingsManager()
@@ -119,6 +193,16 @@ class MainWindow(QMainWindow):
 
         self.ui.textEdit_prompt.setAcceptDrops(False)
         self.ui.plainTextEdit_main.setAcceptDrops(False)
+        self.ui.plainTextEdit_main.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.ui.plainTextEdit_main.customContextMenuRequested.connect(self._show_main_context_menu)
+
+        self.main_stack = QStackedWidget(self.splitter)
+        self.splitter.replaceWidget(self.splitter.indexOf(self.ui.plainTextEdit_main), self.main_stack)
+        self.main_stack.addWidget(self.ui.plainTextEdit_main)
+        self.section_viewer = SectionViewer(self.main_stack)
+        self.section_viewer.setMinimumHeight(50)
+        self.section_viewer.customContextMenuRequested.connect(self._show_section_viewer_context_menu)
+        self.main_stack.addWidget(self.section_viewer)
 
         self.overlay = OverlayWidget(self.ui.centralwidget)
         self.overlay.resize(self.ui.centralwidget.size())
@@ -147,6 +231,8 @@ class MainWindow(QMainWindow):
         self.move((screen.width() - size.width()) // 2, (screen.height() - size.height()) // 2)
 
     def closeEvent(self, event):
+        if self.presenter:
+            self.presenter.shutdown()
         settings_manager = SettingsManager()
         settings_manager.save(self)
         settings_manager.save_window_state(self)
@@ -178,6 +264,34 @@ class MainWindow(QMainWindow):
             self.presenter.handle_dropped_items(file_paths)
         event.acceptProposedAction()
 
+    def _show_main_context_menu(self, pos):
+        editor = self.ui.plainTextEdit_main
+        menu = editor.createStandardContextMenu(pos)
+        if self.presenter:
+            self.presenter.populate_section_menu(menu, editor.cursorForPosition(pos).position())
+        menu.exec(editor.mapToGlobal(pos))
+        menu.deleteLater()
+
+    def _show_section_viewer_context_menu(self, pos):
+        model = self.section_viewer.model()
+        if model is None:
+            return
+        menu = QMenu(self)
+        menu.addAction("Collapse All", lambda: model.set_all_collapsed(True))
+        menu.addAction("Expand All", lambda: model.set_all_collapsed(False))
+        index = self.section_viewer.indexAt(pos)
+        if self.presenter and index.isValid():
+            self.presenter.populate_section_menu_for_row(menu, index.row())
+        menu.exec(self.section_viewer.viewport().mapToGlobal(pos))
+        menu.deleteLater()
+
+    def section_viewer_visible(self) -> bool:
+        return self.main_stack.currentWidget() is self.section_viewer
+
+    def show_section_viewer(self, enabled: bool):
+        self.main_stack.setCurrentWidget(self.section_viewer if enabled else self.ui.plainTextEdit_main)
+        self.action_section_viewer.setChecked(enabled)
+
     def on_splitter_moved(self):
         sizes = self.splitter.sizes()
         total = sum(sizes)
@@ -198,11 +312,66 @@ class MainWindow(QMainWindow):
             if sizes[1] < 50:
                 self.splitter.setSizes([total - 50, 50])
 
-    def set_status_metrics(self, words: int, chars_no_ws: int, chars_ws: int, lines: int):
+    def set_status_metrics(self, words: int, chars_no_ws: int, chars_ws: int, lines: int, tokens: int = 0):
         self._stat_words.setText(f"Words: {words}")
         self._stat_chars_no_ws.setText(f"Characters (no spaces): {chars_no_ws}")
         self._stat_chars_ws.setText(f"Characters: {chars_ws}")
         self._stat_lines.setText(f"Lines: {lines}")
+        self._stat_tokens.setText(f"Tokens: {tokens}")
+
+    def set_tokenizer_name(self, name: str):
+        self._stat_tokens.setToolTip(f"Tokenizer: {name}")
+        self.action_tokenizer_bpe.setText(f"BPE vocabulary ({name})" if self.action_tokenizer_bpe.isChecked()
+                                          else "BPE vocabulary from file...")
+
+    def folder_source(self) -> str:
+        for source, action in self.folder_source_actions.items():
+            if action.isChecked():
+                return source
+        return "filesystem"
+
+    def set_folder_source(self, source: str):
+        self.folder_source_actions.get(source, self.folder_source_actions["filesystem"]).setChecked(True)
+
+    def bring_to_front(self):
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def set_processing_state(self, active: bool):
+        self._progress_label.setVisible(active)
+        self._progress_bar.setVisible(active)
+        self.button_cancel.setVisible(active)
+        self.button_cancel.setEnabled(active)
+        if active:
+            self._progress_bar.setRange(0, 0)
+            self._progress_label.clear()
+
+    def set_progress(self, done: int, total: int, message: str = ""):
+        if total > 0:
+            self._progress_bar.setRange(0, total)
+            self._progress_bar.setValue(done)
+        else:
+            self._progress_bar.setRange(0, 0)
+        self._progress_label.setText(message)
+
+    def set_spill_state(self, active: bool):
+        for w in (self.button_page_prev, self._page_label, self.button_page_next):
+            w.setVisible(active)
+        self.ui.plainTextEdit_main.setReadOnly(active)
+
+    def set_spill_page(self, page: int, pages: int):
+        self._page_label.setText(f"Page {page + 1} of {pages} (on disk)")
+        self.button_page_prev.setEnabled(page > 0)
+        self.button_page_next.setEnabled(page < pages - 1)
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Escape and self.button_cancel.isVisible():
+            self.button_cancel.click()
+            event.accept()
+            return
+        super().keyPressEvent(event)
 
     def set_always_on_top(self, enabled: bool):
         self.setWindowFlag(Qt.WindowStaysOnTopHint, enabled)